@@ -34,6 +34,7 @@ def transform_mart_table(
             raw_table_id=mart_resource.raw_table_id,
             mart_dataset_id=mart_resource.mart_dataset_id,
             mart_table_id=mart_resource.mart_table_id,
+            maximum_bytes_billed=mart_resource.bq_maximum_bytes_billed,
             log_dir=mart_resource.log_dir
         )
         db.connect()
@@ -34,6 +34,7 @@ def scrape_city_listing(
             project_id=scraper_resource.project_id,
             raw_dataset_id=scraper_resource.raw_dataset_id,
             raw_table_id=scraper_resource.raw_table_id,
+            maximum_bytes_billed=scraper_resource.bq_maximum_bytes_billed,
             log_dir=scraper_resource.log_dir
         )
         db.connect()
@@ -61,7 +62,7 @@ def scrape_city_listing(
         context.log.info(f"📤 Inserted {inserted_count} new properties to BigQuery from {provider}")
         
         # Save to JSON
-        filename = f"{provider}_{city}_{listing_type.replace('-', '_')}.json"
+        filename = f"{provider}_{city}_{listing_type.replace('-', '_')}.jsonl"
         output_path = Path(config.PROJECT_ROOT) / "Real_Estate_Data_Pipelines" / "raw_data" / "scraping" / provider / city
         output_path.mkdir(parents=True, exist_ok=True)
         file_path =  output_path / filename
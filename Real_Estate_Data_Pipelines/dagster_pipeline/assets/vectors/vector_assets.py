@@ -30,6 +30,7 @@ def process_to_milvus(context: OpExecutionContext, vector_resource: VectorResour
             project_id=vector_resource.project_id,
             mart_dataset_id=vector_resource.mart_dataset_id,
             mart_table_id=vector_resource.mart_table_id,
+            maximum_bytes_billed=vector_resource.bq_maximum_bytes_billed,
             log_dir=vector_resource.log_dir
         )
 
@@ -41,13 +42,19 @@ def process_to_milvus(context: OpExecutionContext, vector_resource: VectorResour
             milvus_port=vector_resource.milvus_port,
             collection_name=vector_resource.milvus_collection_name,
             embedding_dim=vector_resource.embedding_dim,
-            embedding_model=vector_resource.embedding_model
+            embedding_model=vector_resource.embedding_model,
+            minio_endpoint=vector_resource.minio_endpoint,
+            minio_bucket=vector_resource.minio_bucket,
+            minio_access_key=vector_resource.minio_access_key,
+            minio_secret_key=vector_resource.minio_secret_key
         )
         
         milvus_client.connect()
         
-        # Create collection if not exists
-        milvus_client.create_collection()
+        # Initial load (or a retry of one): fill the collection unindexed and
+        # build the vector index once at the end
+        bulk_mode = not milvus_client.is_indexed()
+        milvus_client.create_collection(bulk_mode=bulk_mode)
 
         # Create text preprocessor object
         text_preprocessor = TextPreprocessor()
@@ -65,6 +72,9 @@ def process_to_milvus(context: OpExecutionContext, vector_resource: VectorResour
         results = pipeline.process_store_to_vdb(
             batch_size=vector_resource.batch_size
         )
+
+        if bulk_mode:
+            milvus_client.finalize_index()
         
         # Get collection stats
         stats = milvus_client.get_collection_stats()
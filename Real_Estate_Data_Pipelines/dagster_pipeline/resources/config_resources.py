@@ -1,4 +1,5 @@
 """Dagster configurable resources"""
+from typing import Optional
 from dagster import ConfigurableResource
 from pydantic import Field
 from Real_Estate_Data_Pipelines.src.config import config
@@ -8,6 +9,7 @@ class ScraperResource(ConfigurableResource):
     project_id: str = Field(default=config.GCP_PROJECT_ID)
     raw_dataset_id: str = Field(default=config.BQ_RAW_DATASET_ID)
     raw_table_id: str = Field(default=config.BQ_RAW_TABLE_ID)
+    bq_maximum_bytes_billed: Optional[int] = Field(default=config.BQ_MAXIMUM_BYTES_BILLED)
     log_dir: str = Field(default=config.LOG_DIR)
     max_pages: int = Field(default=config.MAX_PAGES)
 
@@ -19,6 +21,7 @@ class MartResource(ConfigurableResource):
     raw_table_id: str = Field(default=config.BQ_RAW_TABLE_ID)
     mart_dataset_id: str = Field(default=config.BQ_MART_DATASET_ID)
     mart_table_id: str = Field(default=config.BQ_MART_TABLE_ID)
+    bq_maximum_bytes_billed: Optional[int] = Field(default=config.BQ_MAXIMUM_BYTES_BILLED)
     log_dir: str = Field(default=config.LOG_DIR)
 
 
@@ -27,6 +30,7 @@ class VectorResource(ConfigurableResource):
     project_id: str = Field(default=config.GCP_PROJECT_ID)
     mart_dataset_id: str = Field(default=config.BQ_MART_DATASET_ID)
     mart_table_id: str = Field(default=config.BQ_MART_TABLE_ID)
+    bq_maximum_bytes_billed: Optional[int] = Field(default=config.BQ_MAXIMUM_BYTES_BILLED)
     milvus_host: str = Field(default=config.MILVUS_HOST)
     milvus_port: str = Field(default=config.MILVUS_PORT)
     milvus_collection_name: str = Field(default=config.MILVUS_COLLECTION_NAME)
@@ -34,4 +38,8 @@ class VectorResource(ConfigurableResource):
     embedding_model: str = Field(default=config.EMBEDDING_MODEL)
     embedding_dim: int = Field(default=config.EMBEDDING_DIM)
     batch_size: int = Field(default=config.BATCH_SIZE)
+    minio_endpoint: str = Field(default=config.MINIO_ENDPOINT)
+    minio_bucket: str = Field(default=config.MINIO_BUCKET)
+    minio_access_key: str = Field(default=config.MINIO_ACCESS_KEY)
+    minio_secret_key: str = Field(default=config.MINIO_SECRET_KEY)
     log_dir: str = Field(default=config.LOG_DIR)
\ No newline at end of file
@@ -2,7 +2,7 @@
 import os
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 
@@ -14,6 +14,8 @@ class PipelineConfig(BaseModel):
     BQ_RAW_TABLE_ID: str
     BQ_MART_DATASET_ID: str
     BQ_MART_TABLE_ID: str
+    # Per-query byte cap, queries over it fail instead of billing (None = no cap)
+    BQ_MAXIMUM_BYTES_BILLED: Optional[int] = None
     
     # Scraping Configuration
     MAX_PAGES: int = 1
@@ -27,7 +29,15 @@ class PipelineConfig(BaseModel):
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     GENERATION_MODEL: str
     EMBEDDING_DIM: int = 384
+    EMBEDDING_LINGER_MS: float = 5.0
+    EMBEDDING_BACKEND: Optional[str] = None
     BATCH_SIZE: int = 100
+
+    # MinIO bucket Milvus stores its data in (used by bulk import)
+    MINIO_ENDPOINT: str = "http://localhost:9000"
+    MINIO_BUCKET: str = "a-bucket"
+    MINIO_ACCESS_KEY: str = ""
+    MINIO_SECRET_KEY: str = ""
         
     AWS_ACCESS_KEY_ID: str = "",
     AWS_SECRET_ACCESS_KEY: str =  "",
@@ -1,14 +1,27 @@
 import os
+import gzip
+import io
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
+from requests.adapters import HTTPAdapter
 import tempfile
+import uuid
 import json as json_lib
-from datetime import datetime
-import time
+import orjson
+from datetime import datetime, timedelta
 from typing import List, Optional
 from Real_Estate_Data_Pipelines.src.logger import LoggerFactory
 from .schemes import PropertySchema
 from ..db_models import PropertyModel
 
+# Lower bound used when a query must read every partition of the raw table
+RAW_PARTITION_START = "1970-01-01"
+
+# Above this many ids, exclusions are loaded into a staging table and anti-joined
+# server-side instead of being inlined as an array query parameter
+EXCLUDE_IDS_PARAM_LIMIT = 10_000
+
 class Big_Query_Database():
     def __init__(self,
                 log_dir,
@@ -16,7 +29,8 @@ class Big_Query_Database():
                 raw_dataset_id=None, 
                 raw_table_id=None,
                 mart_dataset_id=None,
-                mart_table_id=None):
+                mart_table_id=None,
+                maximum_bytes_billed=None):
         
         # BigQuery configuration
         self.project_id = project_id
@@ -28,21 +42,50 @@ class Big_Query_Database():
         self.raw_table_ref = f"{project_id}.{raw_dataset_id}.{raw_table_id}"
         self.mart_table_ref = f"{project_id}.{mart_dataset_id}.{mart_table_id}"
         self.log_dir = log_dir
+
+        # Fail fast on accidental full scans (None = no cap)
+        self.maximum_bytes_billed = maximum_bytes_billed
         
         # Initialize logger
         self.logger = LoggerFactory.create_logger(log_dir=self.log_dir)
         self.client = None
 
     def connect(self):
-        # Initialize BigQuery client
+        # Initialize BigQuery client once and reuse it (and its connections) across methods
+        if self.client is not None:
+            return
+
         try:
-            self.client = bigquery.Client(project=self.project_id)
+            credentials, _ = google.auth.default(
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+
+            # Pooled keep-alive session shared by every API call of this client
+            session = AuthorizedSession(credentials)
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount("https://", adapter)
+
+            self.client = bigquery.Client(
+                project=self.project_id,
+                credentials=credentials,
+                _http=session
+            )
             self.logger.info(f"✅ Connected to BigQuery project: {self.project_id}")
         except Exception as e:
             self.logger.info(f"❌ Failed to connect to BigQuery: {e}")
             raise
 
 
+    def _query_job_config(self, query_parameters=None, priority=bigquery.QueryPriority.INTERACTIVE):
+        """Job config shared by all queries: bound parameters, result cache and byte cap"""
+        return bigquery.QueryJobConfig(
+            query_parameters=query_parameters or [],
+            use_query_cache=True,
+            maximum_bytes_billed=self.maximum_bytes_billed,
+            priority=priority
+        )
+
+
     def create_dataset_if_not_exists(self, project_id, dataset_id):
         """Creates the dataset if it doesn't exist."""
         try:
@@ -55,12 +98,16 @@ class Big_Query_Database():
             self.logger.info(f"✅ Created dataset: {dataset_id}")
 
 
-    def create_table_if_not_exists(self, table_ref, schema):
+    def create_table_if_not_exists(self, table_ref, schema, time_partitioning=None, clustering_fields=None):
         try:
             self.client.get_table(table_ref)
             self.logger.info(f"✅ Table {table_ref} exists")
         except Exception as e:
             table = bigquery.Table(table_ref, schema=schema)
+            if time_partitioning:
+                table.time_partitioning = time_partitioning
+            if clustering_fields:
+                table.clustering_fields = clustering_fields
             table = self.client.create_table(table)
             self.logger.info(f"✅ Created table {table_ref}")
 
@@ -72,7 +119,17 @@ class Big_Query_Database():
             return 0
         
         self.create_dataset_if_not_exists(project_id = self.project_id, dataset_id = self.raw_dataset_id)
-        self.create_table_if_not_exists(table_ref = self.raw_table_ref, schema = PropertySchema)
+        self.create_table_if_not_exists(
+            table_ref = self.raw_table_ref,
+            schema = PropertySchema,
+            # Daily partitions on scraped_at so readers only scan the days they need
+            time_partitioning = bigquery.TimePartitioning(
+                type_=bigquery.TimePartitioningType.DAY,
+                field="scraped_at",
+                require_partition_filter=True
+            ),
+            clustering_fields = ["url", "source"]
+        )
 
         self.logger.info("📤 Uploading to BigQuery (Batch Mode)")
 
@@ -128,11 +185,12 @@ class Big_Query_Database():
         # Use batch load with temporary JSON file (FREE TIER COMPATIBLE)
         self.logger.info(f"📤 Batch loading {len(new_items)} new properties...")
         try:
-            # Create temporary NDJSON file (newline-delimited JSON)
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as temp_file:
-                for item in new_items:
-                    json_lib.dump(item, temp_file)
-                    temp_file.write('\n')
+            # Create temporary gzipped NDJSON file (newline-delimited JSON)
+            # BigQuery detects the gzip stream on load; level 1 keeps CPU cost negligible
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.json.gz', delete=False) as temp_file:
+                with gzip.GzipFile(fileobj=temp_file, mode='wb', compresslevel=1) as gz_file:
+                    for item in new_items:
+                        gz_file.write(orjson.dumps(item) + b'\n')
                 temp_file_path = temp_file.name
             
             # Configure load job
@@ -173,15 +231,19 @@ class Big_Query_Database():
                 pass
             return 0
 
-    def load_existing_urls_from_database(self):
-        """Load existing property URLs from BigQuery"""
+    def load_existing_urls_from_database(self, since=None):
+        """Load existing property URLs from BigQuery (scraped on or after `since`, default: all)"""
         try:
             query = f"""
                 SELECT DISTINCT url 
                 FROM `{self.raw_table_ref}`
+                WHERE DATE(scraped_at) >= @since
             """
+            job_config = self._query_job_config([
+                bigquery.ScalarQueryParameter("since", "DATE", since or RAW_PARTITION_START)
+            ])
             self.logger.info("🔍 Loading existing URLs from BigQuery...")
-            query_job = self.client.query(query)
+            query_job = self.client.query(query, job_config=job_config)
             existing_urls = {row.url for row in query_job.result()}
             self.logger.info(f"📂 Loaded {len(existing_urls)} existing URLs from BigQuery")
             return existing_urls
@@ -203,19 +265,35 @@ class Big_Query_Database():
             exclude_ids: Property IDs already in the vector DB (to skip)
 
         Returns:
-            List of validated property dicts ready for vectorization
+            pyarrow.Table of validated properties ready for vectorization
         """
         if not self.client:
             raise RuntimeError("Not connected to BigQuery")
 
         self.logger.info("🔍 Fetching validated properties from BigQuery mart...")
 
-        limit_clause = f"LIMIT {limit}" if limit else ""
-
+        limit_clause = ""
         exclude_clause = ""
-        job_config = None
+        query_parameters = []
+        ids_table_ref = None
 
-        if exclude_ids:
+        if limit:
+            limit_clause = "LIMIT @limit"
+            query_parameters.append(
+                bigquery.ScalarQueryParameter("limit", "INT64", limit)
+            )
+
+        if exclude_ids and len(exclude_ids) > EXCLUDE_IDS_PARAM_LIMIT:
+            # Large id lists would blow the request size limit: anti-join a staging table
+            ids_table_ref = self._stage_property_ids(exclude_ids)
+            exclude_clause = f"""
+            AND property_id IS NOT NULL
+            AND property_id NOT IN (
+                SELECT property_id
+                FROM `{ids_table_ref}`
+            )
+            """
+        elif exclude_ids:
             exclude_clause = """
             AND property_id IS NOT NULL
             AND NOT EXISTS (
@@ -224,14 +302,14 @@ class Big_Query_Database():
                 WHERE pid = property_id
             )
             """
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ArrayQueryParameter(
-                        "exclude_ids", "STRING", exclude_ids
-                    )
-                ]
+            query_parameters.append(
+                bigquery.ArrayQueryParameter(
+                    "exclude_ids", "STRING", exclude_ids
+                )
             )
 
+        job_config = self._query_job_config(query_parameters)
+
         query = f"""
         SELECT
             property_id,
@@ -252,31 +330,55 @@ class Big_Query_Database():
             longitude
         FROM `{self.mart_table_ref}`
         WHERE
-            data_quality = 'complete'
-            AND has_description = TRUE
-            AND price_egp > 1000
-            AND area_sqm >= 10
-            AND bedrooms BETWEEN 0 AND 25
-            AND bathrooms BETWEEN 0 AND 15
-            AND LENGTH(title) >= 3
-            AND LENGTH(description) >= 10
+            is_vectordb_ready = TRUE
             {exclude_clause}
         {limit_clause}
         """
 
         try:
             query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
 
-            properties = [dict(row.items()) for row in results]
+            # Columnar download (BigQuery Storage API when available), no per-row dicts
+            properties = query_job.to_arrow(create_bqstorage_client=True)
 
-            self.logger.info(f"✅ Retrieved {len(properties):,} validated properties")
+            self.logger.info(f"✅ Retrieved {properties.num_rows:,} validated properties")
             return properties
 
         except Exception as e:
             self.logger.error(f"❌ Failed to fetch properties: {e}")
             raise
 
+        finally:
+            # The staging table only serves this query (the expiry covers a crash before this)
+            if ids_table_ref:
+                self.client.delete_table(ids_table_ref, not_found_ok=True)
+
+
+    def _stage_property_ids(self, property_ids: List[str]) -> str:
+        """
+        Load property ids into a short-lived staging table next to the mart
+        (one free batch load job) and return its reference. The table name is
+        unique per call, so concurrent runs never read each other's ids.
+        """
+        ids_table_ref = f"{self.mart_table_ref}_vectordb_ids_{uuid.uuid4().hex}"
+        self.logger.info(f"📤 Staging {len(property_ids):,} excluded ids in {ids_table_ref}")
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.CSV,
+            schema=[bigquery.SchemaField("property_id", "STRING", mode="REQUIRED")],
+            write_disposition=bigquery.WriteDisposition.WRITE_EMPTY
+        )
+        # Ids are '<source>_<hex>' so they need no CSV quoting
+        data = io.BytesIO("\n".join(property_ids).encode("utf-8"))
+        self.client.load_table_from_file(data, ids_table_ref, job_config=job_config).result()
+
+        # Let BigQuery drop the table if the run dies before deleting it
+        table = self.client.get_table(ids_table_ref)
+        table.expires = datetime.utcnow() + timedelta(days=1)
+        self.client.update_table(table, ["expires"])
+
+        return ids_table_ref
+
 
     def create_mart_table(self):
         """Creates partitioned mart table with comprehensive data cleaning and enrichment."""
@@ -285,7 +387,7 @@ class Big_Query_Database():
         
         query = f"""
         CREATE OR REPLACE TABLE `{self.mart_table_ref}`
-        CLUSTER BY location, scraped_date, property_type, listing_type
+        CLUSTER BY is_vectordb_ready, location, scraped_date, property_type
         AS
         WITH cleaned_text AS (
             SELECT
@@ -357,6 +459,7 @@ class Big_Query_Database():
                 
             FROM `{self.raw_table_ref}`
             WHERE scraped_at IS NOT NULL
+                AND DATE(scraped_at) >= '{RAW_PARTITION_START}'
         ),
         
         enriched AS (
@@ -457,6 +560,20 @@ class Big_Query_Database():
             has_description,
             data_quality,
             
+            -- Vector DB eligibility (precomputed so the vector query prunes on the cluster key)
+            CASE
+                WHEN data_quality = 'complete'
+                    AND has_description
+                    AND price_egp > 1000
+                    AND area_sqm >= 10
+                    AND bedrooms BETWEEN 0 AND 25
+                    AND bathrooms BETWEEN 0 AND 15
+                    AND LENGTH(title_cleaned) >= 3
+                    AND LENGTH(description_cleaned) >= 10
+                THEN TRUE
+                ELSE FALSE
+            END AS is_vectordb_ready,
+            
             -- Temporal
             scraped_date,
             scraped_year,
@@ -472,10 +589,10 @@ class Big_Query_Database():
         """
 
         try:
-            self.client.query(query)
+            # Wait for the job instead of sleeping
+            self.client.query(query, job_config=self._query_job_config()).result()
             
             # Get row count
-            time.sleep(3)
             row_count = self.client.get_table(self.mart_table_ref).num_rows
             self.logger.info(f"✅ Mart table updated: {self.mart_table_ref}")
             self.logger.info(f"📊 Total rows: {row_count:,}")
@@ -525,11 +642,12 @@ class Big_Query_Database():
         """
         
         try:
-            self.client.query(query)
+            # Not latency-sensitive: BATCH priority uses idle slots, wait for the job to finish
+            self.client.query(
+                query, job_config=self._query_job_config(priority=bigquery.QueryPriority.BATCH)
+            ).result()
 
             # Get row count
-            time.sleep(3)
-
             row_count = self.client.get_table(summary_ref).num_rows
             self.logger.info(f"✅ Location summary created: {summary_ref}")
             self.logger.info(f"📊 Total rows: {row_count:,}")
@@ -576,11 +694,12 @@ class Big_Query_Database():
         """
         
         try:
-            self.client.query(query)
+            # Not latency-sensitive: BATCH priority uses idle slots, wait for the job to finish
+            self.client.query(
+                query, job_config=self._query_job_config(priority=bigquery.QueryPriority.BATCH)
+            ).result()
 
             # Get row count
-            time.sleep(3)
-
             row_count = self.client.get_table(summary_ref).num_rows
             self.logger.info(f"✅ Property type summary created: {summary_ref}")
             self.logger.info(f"📊 Total rows: {row_count:,}")
@@ -626,11 +745,12 @@ class Big_Query_Database():
         """
         
         try:
-            self.client.query(query)
+            # Not latency-sensitive: BATCH priority uses idle slots, wait for the job to finish
+            self.client.query(
+                query, job_config=self._query_job_config(priority=bigquery.QueryPriority.BATCH)
+            ).result()
 
             # Get row count
-            time.sleep(3)
-
             row_count = self.client.get_table(summary_ref).num_rows
             self.logger.info(f"✅ Time series summary created: {summary_ref}")
             self.logger.info(f"📊 Total rows: {row_count:,}")
@@ -686,11 +806,12 @@ class Big_Query_Database():
         """
         
         try:
-            self.client.query(query)
+            # Not latency-sensitive: BATCH priority uses idle slots, wait for the job to finish
+            self.client.query(
+                query, job_config=self._query_job_config(priority=bigquery.QueryPriority.BATCH)
+            ).result()
 
             # Get row count
-            time.sleep(3)
-
             row_count = self.client.get_table(summary_ref).num_rows
             self.logger.info(f"✅ Price analysis summary created: {summary_ref}")
             self.logger.info(f"📊 Total rows: {row_count:,}")
@@ -804,12 +925,16 @@ class Big_Query_Database():
         """
         
         try:
-            self.client.query(query)
+            self.client.query(
+                query, job_config=self._query_job_config(priority=bigquery.QueryPriority.BATCH)
+            ).result()
 
             self.logger.info(f"✅ Data quality report created: {report_ref}")
             
             # Print the report
-            results = self.client.query(f"SELECT * FROM `{report_ref}`").result()
+            results = self.client.query(
+                f"SELECT * FROM `{report_ref}`", job_config=self._query_job_config()
+            ).result()
             self.logger.info("DATA QUALITY REPORT")
 
             for row in results:
@@ -1,6 +1,10 @@
+import re
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 
+# Compiled once: source prefix (2+ letters) + 16-char lowercase hex hash
+PROPERTY_ID_PATTERN = re.compile(r'[a-z]{2,}_[a-f0-9]{16}')
+
 class PropertyModel(BaseModel):
     """Raw scraped data - lenient validation for initial ingestion"""
     
@@ -56,36 +60,23 @@ class PropertyModel(BaseModel):
     @classmethod
     def validate_property_id_format(cls, v):
         """Validate source_hash format"""
-        if '_' not in v:
-            raise ValueError("property_id must contain underscore separator")
-        
-        source, hash_part = v.rsplit('_', 1)
-        
-        if not source or len(source) < 2:
-            raise ValueError("Source prefix must be at least 2 characters")
-        
-        if len(hash_part) != 16:
-            raise ValueError(f"Hash must be 16 characters, got {len(hash_part)}")
-        
-        if not all(c in '0123456789abcdef' for c in hash_part):
-            raise ValueError("Hash must be lowercase hexadecimal")
+        if not PROPERTY_ID_PATTERN.fullmatch(v):
+            raise ValueError(
+                "property_id must be '<source>_<16 lowercase hex chars>' "
+                "with a source prefix of at least 2 characters"
+            )
         
         return v
     
-    @field_validator('property_id', 'url', 'location', 'source')
-    @classmethod
-    def validate_required_strings(cls, v):
-        """Ensure required strings are not empty"""
-        if not v or not v.strip():
-            raise ValueError("Field cannot be empty")
-        return v.strip()
+    # Required strings are stripped (str_strip_whitespace) and length-checked
+    # (min_length=1) inside pydantic-core, so they need no Python validator.
     
     @field_validator('title', 'description', 'address', 'price_text', 
                      'currency', 'property_type', 'listing_type', 'agent_type')
     @classmethod
-    def strip_optional_strings(cls, v):
-        """Strip whitespace from optional string fields"""
-        return v.strip() if v else None
+    def blank_optional_strings_to_none(cls, v):
+        """Store blank optional strings as NULL (already stripped by str_strip_whitespace)"""
+        return v or None
     
     class Config:
         str_strip_whitespace = True
\ No newline at end of file
@@ -1,8 +1,15 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
+import numpy as np
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 from typing import List, Optional
+from .PropertyModel import PROPERTY_ID_PATTERN
 
-class PropertyVectorsModel(BaseModel):
-    """Validated model for VectorDB insertion - STRICT requirements"""
+# Accepted embedding sizes (min / max length of the embedding field)
+EMBEDDING_MIN_DIM = 384
+EMBEDDING_MAX_DIM = 384 * 4
+
+
+class PropertyVectorsFieldsModel(BaseModel):
+    """Scalar fields of a VectorDB row, for batches whose embeddings are checked as a matrix"""
     
     # Required identity fields
     property_id: str = Field(
@@ -16,9 +23,6 @@ class PropertyVectorsModel(BaseModel):
     url: str = Field(..., min_length=1, max_length=500)
     location: str = Field(..., min_length=2, max_length=200)
     
-    # Required vector field
-    embedding: List[float] = Field(..., min_length=384, max_length=384*4)
-    
     # Required text fields (strict length requirements)
     text: str = Field(..., min_length=10, max_length=12000)
     title: str = Field(..., min_length=3, max_length=500)
@@ -43,23 +47,15 @@ class PropertyVectorsModel(BaseModel):
     @classmethod
     def validate_property_id_format(cls, v):
         """Validate source_hash format (same as PropertyModel)"""
-        if '_' not in v:
-            raise ValueError("property_id must contain underscore separator")
-        
-        source, hash_part = v.rsplit('_', 1)
-        
-        if not source or len(source) < 2:
-            raise ValueError("Source prefix must be at least 2 characters")
-        
-        if len(hash_part) != 16:
-            raise ValueError(f"Hash must be 16 characters, got {len(hash_part)}")
-        
-        if not all(c in '0123456789abcdef' for c in hash_part):
-            raise ValueError("Hash must be lowercase hexadecimal")
+        if not PROPERTY_ID_PATTERN.fullmatch(v):
+            raise ValueError(
+                "property_id must be '<source>_<16 lowercase hex chars>' "
+                "with a source prefix of at least 2 characters"
+            )
         
         return v
     
-    @field_validator('property_id', 'url', 'location', 'source', 'text', 'title', 'property_type')
+    @field_validator('url', 'location', 'source', 'text', 'title', 'property_type')
     @classmethod
     def validate_required_strings(cls, v):
         """Ensure required strings are not empty (same as PropertyModel)"""
@@ -67,23 +63,34 @@ class PropertyVectorsModel(BaseModel):
             raise ValueError("Field cannot be empty")
         return v.strip()
     
+    class Config:
+        str_strip_whitespace = True
+        # Built once per record and never mutated: no assignment validation needed
+        frozen = True
+
+
+class PropertyVectorsModel(PropertyVectorsFieldsModel):
+    """Validated model for VectorDB insertion - STRICT requirements"""
+    
+    # Required vector field
+    embedding: List[float] = Field(..., min_length=EMBEDDING_MIN_DIM, max_length=EMBEDDING_MAX_DIM)
+    
     @field_validator('embedding')
     @classmethod
     def validate_embedding(cls, v):
-        """Ensure embedding is valid"""
-        if len(v) < 384 or len(v) > 384*4:
-            raise ValueError(f"Embedding must be exactly 384 dimensions, got {len(v)}")
+        """Ensure embedding is valid (length and number types are enforced by the Field)"""
+        arr = np.asarray(v, dtype=np.float32)
         
-        if not all(isinstance(x, (int, float)) for x in v):
-            raise ValueError("Embedding must contain only numbers")
+        if not np.isfinite(arr).all():
+            raise ValueError("Embedding must contain only finite numbers")
         
-        # Check for zero vector
-        magnitude = sum(x**2 for x in v) ** 0.5
-        if magnitude == 0:
+        # Check for zero vector (single BLAS dot instead of a Python sum)
+        if float(arr @ arr) == 0.0:
             raise ValueError("Embedding cannot be zero vector")
         
         return v
-    
-    class Config:
-        str_strip_whitespace = True
-        validate_assignment = True
\ No newline at end of file
+
+
+# Built once at import: validates a whole batch in a single pydantic-core call
+PropertyVectorsBatchAdapter = TypeAdapter(List[PropertyVectorsModel])
+PropertyVectorsFieldsBatchAdapter = TypeAdapter(List[PropertyVectorsFieldsModel])
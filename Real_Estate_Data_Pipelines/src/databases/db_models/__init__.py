@@ -1,2 +1,6 @@
 from .PropertyModel import PropertyModel
-from .PropertyVectorsModel import PropertyVectorsModel
\ No newline at end of file
+from .PropertyVectorsModel import (
+    PropertyVectorsModel, PropertyVectorsFieldsModel,
+    PropertyVectorsBatchAdapter, PropertyVectorsFieldsBatchAdapter,
+    EMBEDDING_MIN_DIM, EMBEDDING_MAX_DIM
+)
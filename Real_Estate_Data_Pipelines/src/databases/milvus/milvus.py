@@ -1,50 +1,368 @@
-from pymilvus import MilvusClient
-from typing import List, Dict, Any
+from collections import deque
+from collections.abc import Sized
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import cached_property, lru_cache
+import atexit
+import tempfile
+import time
+import uuid
+import numpy as np
+from pymilvus import DataType, MilvusClient
+from pydantic import ValidationError
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 from Real_Estate_Data_Pipelines.src.logger import LoggerFactory
 from .schemes import get_property_schema
-from ..db_models import PropertyVectorsModel
+from ..db_models import (
+    PropertyVectorsModel, PropertyVectorsBatchAdapter, PropertyVectorsFieldsBatchAdapter,
+    EMBEDDING_MIN_DIM, EMBEDDING_MAX_DIM
+)
+
+
+# Storage precision of the embedding field: Milvus vector type + NumPy dtype sent on the wire
+VECTOR_DTYPES = {
+    "float32": (DataType.FLOAT_VECTOR, np.float32),
+    "float16": (DataType.FLOAT16_VECTOR, np.float16),
+}
+
+# Same size as FP16 with FP32's exponent range but 3 fewer mantissa bits; for unit-norm
+# embeddings FP16 is the more precise of the two, BF16 suits models trained in bf16.
+# NumPy has no bfloat16 of its own, so it is only offered when ml_dtypes is installed
+try:
+    import ml_dtypes
+    VECTOR_DTYPES["bfloat16"] = (DataType.BFLOAT16_VECTOR, ml_dtypes.bfloat16)
+except ImportError:
+    pass
+
+# Embeddings are L2-normalized at ingest, so inner product equals cosine similarity
+# and Milvus skips the per-search normalization COSINE would do
+METRIC_TYPE = "IP"
+
+# Build parameters per supported vector index type
+DEFAULT_INDEX_PARAMS = {
+    "HNSW": {"M": 16, "efConstruction": 200},
+    "IVF_FLAT": {"nlist": 128},
+    "IVF_PQ": {"nlist": 128, "m": 8, "nbits": 8},
+}
+
+# Parquet column types (pyarrow aliases) of the scalar Milvus field types, for bulk import files
+ARROW_TYPES = {
+    DataType.VARCHAR: "string",
+    DataType.INT64: "int64",
+    DataType.FLOAT: "float32",
+}
+
+# Upsert payload sizing: aim well under the proxy's gRPC message limit. Rows are
+# costed at their schema maximum (VARCHAR max_length is in bytes, numbers take 8),
+# so a batch of full-length Arabic texts still fits
+TARGET_BATCH_BYTES = 32 << 20
+NUMERIC_FIELD_BYTES = 8
+
+# How long a fetched row count is reused by get_collection_stats (writes invalidate it)
+STATS_TTL_SECONDS = 30.0
+
+# Live clients shared per Milvus URI: the gRPC channel is thread-safe, so every
+# Milvus_VectorDatabase in the process reuses one channel instead of opening its own
+_CLIENTS: Dict[str, MilvusClient] = {}
+
+# Fields returned by search_vectors when the caller doesn't pick any
+_DEFAULT_OUTPUT_FIELDS = (
+    "property_id", "title", "location", "property_type",
+    "listing_type", "price_egp", "bedrooms", "bathrooms",
+    "area_sqm", "url", "text"
+)
+
+
+def _to_rows(models) -> List[Dict[str, Any]]:
+    """
+    Shallow-copy validated field values into plain dicts for Milvus.
+    All fields are plain str/int/float/list values, so the model's __dict__
+    is already the upsert payload; model_dump() would rebuild it field by field.
+    The embedding is (re)set from the batch's packed matrix before upserting.
+    """
+    return [dict(model.__dict__) for model in models]
+
+
+def _embedding_matrix(batch: List[Dict[str, Any]]):
+    """
+    Pack all embeddings of a batch into one float32 matrix and check finiteness
+    and non-zero norm row-wise (one squared norm per row).
+    
+    Embeddings may be float lists or ndarray rows (as produced by the embedder).
+    
+    Returns:
+        Tuple of (matrix, {row_index: error}), or (None, None) when the embeddings
+        don't stack into a matrix of an accepted size (ragged, missing, model
+        instances...): pydantic then checks them row by row
+    """
+    try:
+        matrix = np.asarray([prop['embedding'] for prop in batch], dtype=np.float32)
+    except (KeyError, TypeError, ValueError):
+        return None, None
+    if matrix.ndim != 2 or not EMBEDDING_MIN_DIM <= matrix.shape[1] <= EMBEDDING_MAX_DIM:
+        return None, None
+    
+    # One pass: a NaN/inf anywhere in a row makes its squared norm non-finite, so the
+    # norms answer both checks without a full-size boolean isfinite() mask
+    # (accumulated in float64 so large finite values can't overflow to inf)
+    squared_norms = np.einsum('ij,ij->i', matrix, matrix, dtype=np.float64)
+    non_finite = ~np.isfinite(squared_norms)
+    zero = squared_norms == 0
+    errors = {int(row): "Embedding must contain only finite numbers" for row in np.flatnonzero(non_finite)}
+    errors.update((int(row), "Embedding cannot be zero vector") for row in np.flatnonzero(zero))
+    return matrix, errors
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a float32 matrix in place, in one pass (zero rows stay zero)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+def _dedupe_rows(rows: List[Dict[str, Any]], embeddings: np.ndarray):
+    """
+    Keep the last row per property_id, Milvus would otherwise apply each duplicate in turn.
+    
+    Returns:
+        Tuple of (rows, embeddings, failed (property_id, error) tuples for the dropped rows)
+    """
+    last_index = {row['property_id']: index for index, row in enumerate(rows)}
+    if len(last_index) == len(rows):
+        return rows, embeddings, []
+    keep = list(last_index.values())
+    dropped = [
+        (row['property_id'], "duplicate property_id in batch")
+        for index, row in enumerate(rows) if last_index[row['property_id']] != index
+    ]
+    return [rows[index] for index in keep], embeddings[keep], dropped
+
+
+def _validate_batch(batch: List[Dict[str, Any]], dim: Optional[int] = None):
+    """
+    Validate a batch of properties in one pydantic-core call.
+    
+    Args:
+        batch: Property dicts (or validated models)
+        dim: Collection embedding dimension, rows with another size fail up front
+    
+    Returns:
+        Tuple of (validated property dicts, float32 embedding matrix of those rows,
+        failed (property_id, error) tuples). Duplicate property_ids keep their last row,
+        the earlier ones are reported as failed.
+    """
+    # Already validated path: models are frozen, so they can't have changed since validation
+    if all(type(prop) is PropertyVectorsModel for prop in batch):
+        rows = _to_rows(batch)
+        return _dedupe_rows(rows, np.asarray([row['embedding'] for row in rows], dtype=np.float32))
+    
+    # Deterministic guard: rows without an id or an embedding of the collection's size can't
+    # pass, fail them without pydantic (a wrong-size row would also fail the whole upsert)
+    row_errors = {}
+    for row, prop in enumerate(batch):
+        if not isinstance(prop, dict):
+            continue
+        embedding = prop.get('embedding')
+        if not prop.get('property_id'):
+            row_errors[row] = ["property_id: missing"]
+        elif not isinstance(embedding, Sized) or (dim is not None and len(embedding) != dim):
+            row_errors[row] = [f"embedding: missing or not of dimension {dim}"]
+    candidates = [row for row in range(len(batch)) if row not in row_errors]
+    checked = [batch[row] for row in candidates] if row_errors else batch
+    
+    # Embeddings dominate the cost: check them row-wise in NumPy and let pydantic validate
+    # only the scalar fields, so embeddings never go through per-float list coercion
+    matrix, embedding_errors = _embedding_matrix(checked)
+    adapter = PropertyVectorsBatchAdapter if matrix is None else PropertyVectorsFieldsBatchAdapter
+    # Error locations are (index in checked, field, ...): group messages per batch row
+    for index, error in (embedding_errors or {}).items():
+        row_errors[candidates[index]] = [f"embedding: {error}"]
+    
+    try:
+        models = adapter.validate_python(checked)
+    except ValidationError as e:
+        for err in e.errors():
+            index, *field = err['loc']
+            row_errors.setdefault(candidates[index], []).append(f"{'.'.join(map(str, field))}: {err['msg']}")
+        
+        # Re-validate only the rows that had no errors
+        valid_rows = [batch[row] for row in candidates if row not in row_errors]
+        models = adapter.validate_python(valid_rows)
+    else:
+        models = [model for row, model in zip(candidates, models) if row not in row_errors]
+    
+    failed_records = [
+        (batch[row].get('property_id'), "; ".join(errors))
+        for row, errors in row_errors.items()
+    ]
+    rows = _to_rows(models)
+    
+    # Rows validated without their embedding get it back from the packed matrix
+    if matrix is not None:
+        valid = [index for index, row in enumerate(candidates) if row not in row_errors]
+        embeddings = matrix if len(valid) == len(matrix) else matrix[valid]
+    else:
+        embeddings = np.asarray([row['embedding'] for row in rows], dtype=np.float32)
+    rows, embeddings, duplicates = _dedupe_rows(rows, embeddings)
+    return rows, embeddings, failed_records + duplicates
+
+
+def _validated_batches(batches, dim=None, val_pool=None, depth=0):
+    """
+    Yield (batch, (validated, embeddings, failed)) for each batch.
+    With a process pool, up to `depth` batches are validated ahead on other cores
+    while the caller is busy with the current one.
+    """
+    if val_pool is None:
+        for batch in batches:
+            yield batch, _validate_batch(batch, dim)
+        return
+    
+    pending = deque()
+    for batch in batches:
+        pending.append((batch, val_pool.submit(_validate_batch, batch, dim)))
+        if len(pending) > depth:
+            batch, future = pending.popleft()
+            yield batch, future.result()
+    while pending:
+        batch, future = pending.popleft()
+        yield batch, future.result()
+
 
 class Milvus_VectorDatabase():
 
     def __init__(self, log_dir, milvus_host, milvus_port, 
-                 collection_name, embedding_model, embedding_dim=768):
+                 collection_name, embedding_model, embedding_dim=768,
+                 index_type="HNSW", index_params=None, embedding_dtype="float16",
+                 hnsw_m=None, hnsw_ef_construction=None,
+                 minio_endpoint=None, minio_bucket=None, minio_access_key=None, minio_secret_key=None):
         self.log_dir = log_dir
         self.milvus_uri = f"http://{milvus_host}:{milvus_port}"
+        # Object store Milvus keeps its data in, only needed by insert_properties_bulk
+        self.minio_endpoint = minio_endpoint
+        self.minio_bucket = minio_bucket
+        self.minio_access_key = minio_access_key
+        self.minio_secret_key = minio_secret_key
         self.embedding_dim = embedding_dim
         self.embedding_model = embedding_model
+        
+        # FP16 halves vector bytes on the wire, in memory and per distance computation
+        if embedding_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported embedding_dtype {embedding_dtype!r}, expected one of {list(VECTOR_DTYPES)}")
+        self.embedding_dtype = embedding_dtype
+        self.vector_datatype, self.vector_np_dtype = VECTOR_DTYPES[embedding_dtype]
+        
+        # Vector index (HNSW by default: better recall/latency than IVF_FLAT at nprobe=64)
+        if index_type not in DEFAULT_INDEX_PARAMS:
+            raise ValueError(f"Unsupported index_type {index_type!r}, expected one of {list(DEFAULT_INDEX_PARAMS)}")
+        self.index_type = index_type
+        self.index_params = dict(index_params or DEFAULT_INDEX_PARAMS[index_type])
+        # HNSW graph degree / build candidate list, tunable without passing full index_params
+        if index_type == "HNSW":
+            if hnsw_m is not None:
+                self.index_params["M"] = hnsw_m
+            if hnsw_ef_construction is not None:
+                self.index_params["efConstruction"] = hnsw_ef_construction
         self.collection_name = (
             f"{collection_name}_"
-            f"{self.embedding_model.replace(':','_').replace('-', '_').replace('/', '_')}_"
+            f"{self._sanitize_model_name(self.embedding_model)}_"
             f"{self.embedding_dim}"
-)        
-        # Initialize logger
-        self.logger = LoggerFactory.create_logger(log_dir=self.log_dir)
+            # Non-FP32 collections get their own name, an existing FP32 collection can't take FP16 rows
+            f"{'' if embedding_dtype == 'float32' else '_' + embedding_dtype}"
+            # Metric and index type are fixed per collection too: a collection built with another
+            # one (e.g. a COSINE / IVF_FLAT one from before) must not be loaded and searched as this one
+            f"_{self.index_type.lower()}_{METRIC_TYPE.lower()}"
+        )
+        # Rows per upsert so a batch of worst-case rows stays within TARGET_BATCH_BYTES
+        row_bytes = embedding_dim * np.dtype(self.vector_np_dtype).itemsize + sum(
+            field.get("max_length", NUMERIC_FIELD_BYTES)
+            for field in get_property_schema(embedding_dim, self.vector_datatype)["fields"]
+            if field["field_name"] != "embedding"
+        )
+        self.optimal_batch_size = max(256, min(10_000, TARGET_BATCH_BYTES // row_bytes))
         self.client = None
+        self._loaded = False
+        # (monotonic fetch time, row_count) of the last stats RPC
+        self._stats_cache = None
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _sanitize_model_name(model_name: str) -> str:
+        """Make a model name safe for a collection name (cached per model)"""
+        return model_name.replace(':', '_').replace('-', '_').replace('/', '_')
+
+    @cached_property
+    def logger(self):
+        """Logger created on first use, keeping file-handler setup out of __init__"""
+        return LoggerFactory.create_logger(log_dir=self.log_dir)
 
     def connect(self):
-        """Connect using MilvusClient"""
+        """Connect using MilvusClient (shared per URI across instances)"""
+        client = _CLIENTS.get(self.milvus_uri)
+        if client is not None:
+            self.client = client
+            self.logger.info(f"♻️ Reusing Milvus connection to {self.milvus_uri}")
+            return
+        
         self.logger.info(f"💾 Connecting to Milvus at {self.milvus_uri}...")
         try:
-            self.client = MilvusClient(uri=self.milvus_uri)
+            self.client = _CLIENTS.setdefault(self.milvus_uri, MilvusClient(uri=self.milvus_uri))
             self.logger.info("✅ Successfully connected to Milvus")
         except Exception as e:
             self.logger.error(f"Milvus connection failed: {e}")
             raise ConnectionError(f"Failed to connect to Milvus") from e
 
     def close(self):
-        """Close connection"""
+        """Detach from the shared connection (use shutdown() to actually close it)"""
         if self.client:
-            self.client.close()
+            self.client = None
+            self._loaded = False
+            self._stats_cache = None
             self.logger.info("Disconnected from Milvus")
+
+    @staticmethod
+    def shutdown():
+        """Close every shared Milvus connection (registered to run at interpreter exit)"""
+        while _CLIENTS:
+            _, client = _CLIENTS.popitem()
+            client.close()
              
                     
-    def create_collection(self):
-        """Create collection using client API"""
+    def _vector_index_params(self):
+        """Index params holding the embedding vector index"""
+        index_params = self.client.prepare_index_params()
+        index_params.add_index(
+            field_name="embedding",
+            index_type=self.index_type,
+            metric_type=METRIC_TYPE,
+            params=self.index_params
+        )
+        return index_params
+
+    def create_collection(self, num_shards: int = 1, bulk_mode: bool = False):
+        """
+        Create collection using client API.
+        
+        Args:
+            num_shards: Number of shards (DML channels). Concurrent upserts into a
+                single-shard collection all go through one channel, more shards let
+                Milvus spread ingestion across data nodes. Fixed at creation time.
+            bulk_mode: Create the collection without the vector index for an initial
+                load, so inserts don't pay index maintenance. Call finalize_index()
+                once the data is in.
+        """
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
+        self._stats_cache = None
+        
         try:
-            if self.load_collection():
+            # An unindexed collection can't be loaded yet, only check it exists
+            if bulk_mode and self.client.has_collection(self.collection_name):
+                self.logger.info(f"✅ Collection {self.collection_name} exists, ready for bulk load")
+                return
+            
+            if not bulk_mode and self.load_collection():
                 # Load collection for querying
                 self.logger.info(f"✅ Collection {self.collection_name} loaded and ready")
                 return
@@ -59,51 +377,68 @@ class Milvus_VectorDatabase():
             )
             
             # Add fields to schema
-            schema_fields = get_property_schema(self.embedding_dim)
+            schema_fields = get_property_schema(self.embedding_dim, self.vector_datatype)
             for field in schema_fields["fields"]:
                 schema.add_field(**field)
             
             self.logger.info(f"📋 Schema created with {len(schema_fields['fields'])} fields")
             
-            # Create index for vector field
-            index_params = self.client.prepare_index_params()
-            
-            # Add vector index for embeddings
-            index_params.add_index(
-                field_name="embedding",
-                index_type="IVF_FLAT",
-                metric_type="COSINE",
-                params={"nlist": 128}
-            )
-            
-            # Add scalar index for property_id
-            index_params.add_index(
-                field_name="property_id",
-                index_type="Trie",
-                metric_type="L2"
-            )
-            
+            # property_id is the primary key, Milvus indexes it natively: only the vector needs one
             self.logger.info("📊 Indexes configured:")
-            self.logger.info("  - Vector: embedding (IVF_FLAT, COSINE)")
-            self.logger.info("  - Scalar: property_id (TRIE)")
-            
-            # Create collection with schema and index
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                schema=schema,
-                index_params=index_params
-            )
+            if bulk_mode:
+                self._loaded = False
+                self.logger.info(f"  - Vector: embedding ({self.index_type}) deferred to finalize_index()")
+                # create_collection() loads the collection when given index params, which
+                # fails without a vector index: create it bare
+                self.client.create_collection(
+                    collection_name=self.collection_name,
+                    schema=schema,
+                    num_shards=num_shards
+                )
+            else:
+                self.logger.info(f"  - Vector: embedding ({self.index_type}, {METRIC_TYPE}, {self.index_params})")
+                # Create collection with schema and index
+                self.client.create_collection(
+                    collection_name=self.collection_name,
+                    schema=schema,
+                    index_params=self._vector_index_params(),
+                    num_shards=num_shards
+                )
             
             self.logger.info(f"✅ Collection '{self.collection_name}' created successfully!")
             self.logger.info(f" - Embedding dimension: {self.embedding_dim}")
-            self.logger.info(f" - Metric type: COSINE similarity")
-            self.logger.info(f" - Vector index: IVF_FLAT")
-            self.logger.info(f" - Scalar index: property_id (TRIE)")
+            self.logger.info(f" - Shards: {num_shards}")
+            self.logger.info(f" - Metric type: {METRIC_TYPE} (normalized vectors)")
+            self.logger.info(f" - Vector index: {self.index_type}")
             
         except Exception as e:
             self.logger.error(f"❌ Failed to create collection: {e}")
             raise
 
+    def is_indexed(self) -> bool:
+        """Whether the collection exists with its vector index (False before finalize_index())"""
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        return (self.client.has_collection(self.collection_name)
+                and bool(self.client.list_indexes(self.collection_name, field_name="embedding")))
+
+    def finalize_index(self):
+        """Build the vector index once after a bulk_mode load, then load the collection for search"""
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        try:
+            self.logger.info(f"🏗️ Building {self.index_type} index on {self.collection_name}...")
+            # Flush the growing segments so the index is built over sealed data
+            self.client.flush(self.collection_name)
+            self.client.create_index(self.collection_name, self._vector_index_params())
+            self.load_collection()
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to build vector index: {e}")
+            raise
+
     def delete_collection(self):
         """Delete the collection (use with caution!)"""
         if not self.client:
@@ -112,6 +447,8 @@ class Milvus_VectorDatabase():
         try:
             if self.client.has_collection(self.collection_name):
                 self.client.drop_collection(self.collection_name)
+                self._loaded = False
+                self._stats_cache = None
                 self.logger.info(f"🗑️ Collection '{self.collection_name}' deleted")
             else:
                 self.logger.warning(f"⚠️ Collection '{self.collection_name}' does not exist")
@@ -121,152 +458,340 @@ class Milvus_VectorDatabase():
             raise
 
     
-    def insert_properties(self, properties: List[Dict[str, Any]], 
-                         batch_size: int = 1000) -> Dict[str, Any]:
+    def insert_properties(self, properties: Iterable[Union[Dict[str, Any], PropertyVectorsModel]], 
+                         batch_size: Optional[int] = None, max_inflight: int = 4,
+                         validation_workers: int = 0) -> Dict[str, Any]:
         """
         Insert properties with validation and batching.
         
+        `properties` may be any iterable (list, generator, ...); batches are pulled
+        lazily with islice. Upserts run on a small thread pool (the gRPC channel is
+        thread-safe) so the next batch is validated while up to `max_inflight`
+        batches are on the wire. Batches made of PropertyVectorsModel instances
+        skip validation entirely.
+        
+        With `validation_workers` > 0, batches are validated ahead on a process pool
+        of that size. Rows are pickled to the workers, so this only pays off when
+        validation, not the upsert RPC, is the bottleneck.
+        
+        `batch_size` defaults to optimal_batch_size, derived from the schema's maximum row size.
+        
         Returns:
             Dict with statistics: {'total', 'inserted', 'failed', 'failed_records'}
         """
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
-        if not properties:
-            self.logger.warning("No properties to insert")
-            return {'total': 0, 'inserted': 0, 'failed': 0, 'failed_records': []}
-        
-        
+        batch_size = batch_size or self.optimal_batch_size
+        total = 0
         total_inserted = 0
-        failed_records = []
-        total_batches = (len(properties) + batch_size - 1) // batch_size
+        # (property_id, error) tuples, turned into dicts only once for the return value
+        failed_records: List[Tuple[str, str]] = []
+        # Only known up front when the input has a length
+        total_batches = (len(properties) + batch_size - 1) // batch_size if isinstance(properties, Sized) else None
+        inflight = deque()
         
-        self.logger.info(f"📥 Inserting {len(properties):,} properties...")
+        if total_batches is not None:
+            self.logger.info(f"📥 Inserting {len(properties):,} properties...")
+        else:
+            self.logger.info("📥 Inserting properties (streaming)...")
         
-        for i in range(0, len(properties), batch_size):
-            batch = properties[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            batch_validated = []
-            
-            # Validate batch
-            for prop in batch:
-                try:
-                    validated = PropertyVectorsModel(**prop)
-                    batch_validated.append(validated.model_dump())
-                except Exception as e:
-                    self.logger.warning(f"Validation failed for {prop.get('property_id')}: {e}")
-                    failed_records.append({
-                        'property_id': prop.get('property_id'),
-                        'error': str(e)
-                    })
-            
-            # Insert validated batch
-            if batch_validated:
-                try:
-                    result = self.client.upsert(
-                        collection_name=self.collection_name,
-                        data=batch_validated
+        properties = iter(properties)
+        batches = iter(lambda: list(islice(properties, batch_size)), [])
+        val_pool_context = (
+            ProcessPoolExecutor(max_workers=validation_workers) if validation_workers > 0 else nullcontext()
+        )
+        
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor, val_pool_context as val_pool:
+            validated_batches = _validated_batches(
+                batches, self.embedding_dim, val_pool, depth=validation_workers
+            )
+            for batch_num, (batch, (batch_validated, embeddings, batch_failed)) in enumerate(validated_batches, 1):
+                total += len(batch)
+                
+                # Report validation failures once per batch (details go to failed_records)
+                if batch_failed:
+                    property_id, error = batch_failed[0]
+                    self.logger.warning(
+                        "Batch %d: %d records failed validation (e.g. %s: %s)",
+                        batch_num, len(batch_failed), property_id, error
                     )
-                    inserted = result.get('insert_count', len(batch_validated))
-                    total_inserted += inserted
+                failed_records.extend(batch_failed)
+                
+                # Insert validated batch (bounded number of upserts in flight)
+                if batch_validated:
+                    # Normalize the whole float32 batch matrix in one op, then pack
+                    # in the collection's storage precision
+                    embeddings = _normalize_rows(embeddings).astype(self.vector_np_dtype, copy=False)
+                    for row, embedding in zip(batch_validated, embeddings):
+                        row['embedding'] = embedding
                     
-                    if batch_num % 10 == 0 or batch_num == total_batches:
-                        self.logger.info(
-                            f"   Batch {batch_num}/{total_batches}: "
-                            f"{total_inserted:,} inserted"
+                    if len(inflight) >= max_inflight:
+                        total_inserted += self._collect_upsert(
+                            *inflight.popleft(), failed_records, total_batches, total_inserted
                         )
-                except Exception as e:
-                    self.logger.error(f"❌ Batch {batch_num} insert failed: {e}")
-                    for prop in batch_validated:
-                        failed_records.append({
-                            'property_id': prop.get('property_id'),
-                            'error': f"Insert failed: {str(e)}"
-                        })
+                    future = executor.submit(
+                        self.client.upsert,
+                        collection_name=self.collection_name,
+                        data=batch_validated
+                    )
+                    inflight.append((batch_num, batch_validated, future))
+            
+            while inflight:
+                total_inserted += self._collect_upsert(
+                    *inflight.popleft(), failed_records, total_batches, total_inserted
+                )
+        
+        # Row count changed
+        self._stats_cache = None
+        
+        if total == 0:
+            self.logger.warning("No properties to insert")
+            return {'total': 0, 'inserted': 0, 'failed': 0, 'failed_records': []}
         
-        success_rate = (total_inserted / len(properties) * 100) if properties else 0
+        success_rate = total_inserted / total * 100
         
-        self.logger.info(f"✅ Insert complete: {total_inserted:,}/{len(properties):,} "
+        self.logger.info(f"✅ Insert complete: {total_inserted:,}/{total:,} "
                         f"({success_rate:.1f}% success)")
         
         if failed_records:
             self.logger.warning(f"⚠️ {len(failed_records)} records failed")
         
         return {
-            'total': len(properties),
+            'total': total,
             'inserted': total_inserted,
             'failed': len(failed_records),
-            'failed_records': failed_records
+            'failed_records': [
+                {'property_id': property_id, 'error': error}
+                for property_id, error in failed_records
+            ]
         }
+
+    def insert_properties_arrow(self, table: "pyarrow.Table", batch_size: Optional[int] = None,
+                                **kwargs) -> Dict[str, Any]:
+        """
+        Insert properties from an Arrow table (e.g. BigQuery results plus an embedding column).
+        
+        Rows become Python dicts one record batch at a time, so a large table never exists
+        as a single list of dicts; validation and upserts are insert_properties'.
+        
+        Returns:
+            Dict with statistics: {'total', 'inserted', 'failed', 'failed_records'}
+        """
+        batch_size = batch_size or self.optimal_batch_size
+        rows = chain.from_iterable(
+            record_batch.to_pylist() for record_batch in table.to_batches(max_chunksize=batch_size)
+        )
+        return self.insert_properties(rows, batch_size=batch_size, **kwargs)
+
+    def _collect_upsert(self, batch_num, batch_validated, future, 
+                        failed_records, total_batches, total_inserted) -> int:
+        """Wait for one in-flight upsert; return its insert count (0 and failed records on error)"""
+        try:
+            result = future.result()
+            inserted = result.get('insert_count', len(batch_validated))
+            
+            if batch_num % 10 == 0 or batch_num == total_batches:
+                self.logger.info(
+                    f"   Batch {batch_num}/{total_batches or '?'}: "
+                    f"{total_inserted + inserted:,} inserted"
+                )
+            return inserted
+        except Exception as e:
+            self.logger.error(f"❌ Batch {batch_num} insert failed: {e}")
+            error = f"Insert failed: {str(e)}"
+            failed_records.extend((prop.get('property_id'), error) for prop in batch_validated)
+            return 0
     
+    def insert_properties_bulk(self, properties: Iterable[Union[Dict[str, Any], PropertyVectorsModel]],
+                               s3_prefix: str = "bulk_import", batch_size: Optional[int] = None,
+                               poll_interval: float = 5.0, timeout: float = 3600) -> Dict[str, Any]:
+        """
+        Initial-load path: write validated properties to one Parquet file in the bucket
+        Milvus keeps its data in (MinIO/S3), then import it server-side with bulk_import.
+        The import bypasses the WAL and per-RPC overhead of upsert; keep insert_properties
+        for incremental deltas. Needs the minio_* connection settings of the constructor.
+        
+        Args:
+            properties: Iterable of property dicts (or validated models)
+            s3_prefix: Key prefix for the import files inside the bucket
+            batch_size: Validation / Parquet row group size (default: optimal_batch_size)
+            poll_interval: Seconds between import progress checks
+            timeout: Max seconds to wait for the import job
+        
+        Returns:
+            Dict with statistics: {'total', 'inserted', 'failed', 'failed_records'}
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        if not all((self.minio_endpoint, self.minio_bucket, self.minio_access_key, self.minio_secret_key)):
+            # Never fall back to the ambient AWS credentials, those belong to the real S3 account
+            raise RuntimeError("Bulk import needs minio_endpoint, minio_bucket, minio_access_key and minio_secret_key")
+        
+        # Only this initial-load path needs these (bulk_writer is the pymilvus[bulk_writer] extra),
+        # importing the module for upserts and search must not depend on them
+        import boto3
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from pymilvus.bulk_writer import bulk_import, get_import_progress
+        
+        # Parquet columns follow the collection schema. Milvus 2.4 reads float vectors as
+        # list<float> but FP16/BF16 vectors as list<uint8> of their raw little-endian bytes
+        if self.vector_np_dtype == np.float32:
+            embedding_type = pa.list_(pa.float32())
+        else:
+            embedding_type = pa.list_(pa.uint8())
+        arrow_schema = pa.schema([
+            (field["field_name"],
+             embedding_type if field["field_name"] == "embedding" else pa.type_for_alias(ARROW_TYPES[field["datatype"]]))
+            for field in get_property_schema(self.embedding_dim, self.vector_datatype)["fields"]
+        ])
+        
+        batch_size = batch_size or self.optimal_batch_size
+        total = 0
+        written = 0
+        failed_records: List[Tuple[str, str]] = []
+        
+        self.logger.info("📦 Preparing bulk import file...")
+        
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".parquet") as tmp:
+                with pq.ParquetWriter(tmp.name, arrow_schema) as writer:
+                    properties = iter(properties)
+                    for batch in iter(lambda: list(islice(properties, batch_size)), []):
+                        total += len(batch)
+                        rows, embeddings, batch_failed = _validate_batch(batch, self.embedding_dim)
+                        failed_records.extend(batch_failed)
+                        if not rows:
+                            continue
+                        
+                        vectors = _normalize_rows(embeddings).astype(self.vector_np_dtype, copy=False)
+                        if self.vector_np_dtype != np.float32:
+                            vectors = vectors.view(np.uint8)
+                        columns = {
+                            name: [row[name] for row in rows]
+                            for name in arrow_schema.names if name != "embedding"
+                        }
+                        offsets = np.arange(0, vectors.size + 1, vectors.shape[1], dtype=np.int32)
+                        columns["embedding"] = pa.ListArray.from_arrays(offsets, vectors.ravel())
+                        writer.write_table(pa.table(columns, schema=arrow_schema))
+                        written += len(rows)
+                
+                if written == 0:
+                    self.logger.warning("No valid properties to import")
+                    return {
+                        'total': total, 'inserted': 0, 'failed': len(failed_records),
+                        'failed_records': [
+                            {'property_id': property_id, 'error': error}
+                            for property_id, error in failed_records
+                        ]
+                    }
+                
+                s3_key = f"{s3_prefix}/{self.collection_name}/part-{uuid.uuid4().hex}.parquet"
+                self.logger.info(f"📤 Uploading {written:,} rows to s3://{self.minio_bucket}/{s3_key}")
+                boto3.client(
+                    "s3",
+                    endpoint_url=self.minio_endpoint,
+                    aws_access_key_id=self.minio_access_key,
+                    aws_secret_access_key=self.minio_secret_key
+                ).upload_file(tmp.name, self.minio_bucket, s3_key)
+            
+            response = bulk_import(url=self.milvus_uri, collection_name=self.collection_name, files=[[s3_key]])
+            job_id = response.json()['data']['jobId']
+            self.logger.info(f"🚚 Bulk import job {job_id} started")
+            
+            deadline = time.monotonic() + timeout
+            while True:
+                progress = get_import_progress(url=self.milvus_uri, job_id=job_id).json()['data']
+                state = progress.get('state')
+                if state == 'Completed':
+                    break
+                if state == 'Failed':
+                    raise RuntimeError(f"Bulk import job {job_id} failed: {progress.get('reason')}")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Bulk import job {job_id} not finished after {timeout}s (state: {state})")
+                time.sleep(poll_interval)
+        
+        except Exception as e:
+            self.logger.error(f"❌ Bulk import failed: {e}")
+            raise
+        
+        self._stats_cache = None
+        self.logger.info(f"✅ Bulk import complete: {written:,}/{total:,}")
+        if failed_records:
+            self.logger.warning(f"⚠️ {len(failed_records)} records failed validation")
+        
+        return {
+            'total': total,
+            'inserted': written,
+            'failed': len(failed_records),
+            'failed_records': [
+                {'property_id': property_id, 'error': error}
+                for property_id, error in failed_records
+            ]
+        }
 
     def get_property_ids(self, batch_size: int = 10_000) -> List[Any]:
         """
-        Fetch all unique property_ids from the Milvus collection using cursor-based pagination.
+        Fetch all unique property_ids from the Milvus collection with a server-side query iterator.
+        property_id is the primary key, so the ids are unique (in segment order, not sorted).
         """
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
-        # Ensure collection is loaded and property_id has index
-        self.client.load_collection(self.collection_name)
+        # A bulk_mode collection can't be loaded before finalize_index(): nothing to skip,
+        # upserts overwrite any rows an interrupted initial load already wrote
+        if not self._loaded and not self.is_indexed():
+            self.logger.info(f"🆕 Collection {self.collection_name} is not indexed yet, no ids to skip")
+            return []
+        
+        self._ensure_loaded()
         
         self.logger.info("🔍 Fetching unique property_ids from Milvus...")
         
-        unique_ids = set()
-        last_property_id = None
-        total_fetched = 0
+        property_ids: List[str] = []
         iteration = 0
         
         try:
-            while True:
-                iteration += 1
-                
-                # Build filter for cursor-based pagination
-                filter_expression = ""
-                if last_property_id is not None:
-                    filter_expression = f'property_id > "{last_property_id}"'
-                
-                # Query with index support
-                results = self.client.query(
-                    collection_name=self.collection_name,
-                    filter=filter_expression,
-                    output_fields=["property_id"],
-                    limit=batch_size,
-                    order_by=[("property_id", "ASC")]
-                )
-                
-                if not results:
-                    break
-                
-                batch_count = len(results)
-                total_fetched += batch_count
-                
-                for row in results:
-                    if "property_id" in row:
-                        unique_ids.add(row["property_id"])
-                        last_property_id = row["property_id"]
-                
-                # Log progress every 10 iterations
-                if iteration % 10 == 0:
-                    self.logger.debug(
-                        f"Progress: iteration {iteration}, "
-                        f"fetched {total_fetched:,} records"
-                    )
-                
-                # Exit when we've fetched all records
-                if batch_count < batch_size:
-                    break
-            
-            self.logger.info(
-                f"✅ Retrieved {len(unique_ids):,} unique property_ids "
-                f"from {total_fetched:,} total records"
+            # One server-side cursor and query plan for the whole scan
+            iterator = self.client.query_iterator(
+                collection_name=self.collection_name,
+                batch_size=batch_size,
+                output_fields=["property_id"]
             )
             
-            return sorted(list(unique_ids))
+            try:
+                while True:
+                    results = iterator.next()
+                    if not results:
+                        break
+                    
+                    iteration += 1
+                    property_ids.extend(row["property_id"] for row in results)
+                    
+                    # Log progress every 10 iterations
+                    if iteration % 10 == 0:
+                        # Lazy %-formatting: the message is only built if DEBUG is enabled
+                        self.logger.debug(
+                            "Progress: iteration %d, fetched %d records",
+                            iteration, len(property_ids)
+                        )
+            finally:
+                iterator.close()
+            
+            self.logger.info(f"✅ Retrieved {len(property_ids):,} unique property_ids")
+            
+            return property_ids
             
         except Exception as e:
             self.logger.error(f"❌ Failed to fetch property_ids: {e}")      
             raise
 
+    def _ensure_loaded(self):
+        """Load the collection once per connection instead of one load RPC per call"""
+        if not self._loaded:
+            self.load_collection()
+
     def load_collection(self) -> bool:
         """Load collection into memory for querying"""
         if not self.client:
@@ -275,6 +800,7 @@ class Milvus_VectorDatabase():
         try:
             if self.client.has_collection(self.collection_name):
                 self.client.load_collection(self.collection_name)
+                self._loaded = True
                 self.logger.info(f"✅ Collection '{self.collection_name}' loaded and ready")
                 return True
             else:
@@ -287,7 +813,7 @@ class Milvus_VectorDatabase():
 
     def search_vectors(self, query_embedding: List[float], filter_expr: str = None, 
                     limit: int = 10, output_fields: List[str] = None,
-                    nprobe: int = 64) -> List[Dict[str, Any]]:
+                    nprobe: int = 64, ef: int = 64) -> List[Dict[str, Any]]:
         """
         Search for similar vectors in the collection.
         
@@ -296,7 +822,8 @@ class Milvus_VectorDatabase():
             filter_expr: Filter expression for metadata filtering
             limit: Number of results to return
             output_fields: List of fields to return in results
-            nprobe: Number of clusters to search (higher = more accurate but slower)
+            nprobe: Number of clusters to search for IVF indexes (higher = more accurate but slower)
+            ef: HNSW search candidate list size, must be >= limit (higher = more accurate but slower)
         
         Returns:
             List of formatted search results with similarity scores
@@ -305,48 +832,38 @@ class Milvus_VectorDatabase():
             raise RuntimeError("Not connected. Call connect() first.")
         
         try:
-            # Default output fields if none provided
-            if output_fields is None:
-                output_fields = [
-                    "property_id", "title", "location", "property_type",
-                    "listing_type", "price_egp", "bedrooms", "bathrooms",
-                    "area_sqm", "url", "text"
-                ]
+            output_fields = tuple(output_fields) if output_fields else _DEFAULT_OUTPUT_FIELDS
             
             # Prepare search parameters
             search_params = {
-                "metric_type": "COSINE",
-                "params": {"nprobe": nprobe}
+                "metric_type": METRIC_TYPE,
+                "params": {"ef": max(ef, limit)} if self.index_type == "HNSW" else {"nprobe": nprobe}
             }
             
+            # Normalize the query like the stored vectors so IP scores are cosine similarities
+            query_vector = _normalize_rows(np.array(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+            
             # Perform search
             results = self.client.search(
                 collection_name=self.collection_name,
-                data=[query_embedding],
+                data=[query_vector.astype(self.vector_np_dtype, copy=False)],
                 anns_field="embedding",
                 search_params=search_params,
                 limit=limit,
                 filter=filter_expr,
-                output_fields=output_fields
+                output_fields=list(output_fields)
             )
             
-            # Format results
-            formatted_results = []
-            for hits in results:
-                for hit in hits:
-                    # Calculate similarity from distance (COSINE: similarity = 1 - distance)
-                    similarity = max(0, 1 - hit['distance'])
-                    
-                    result = {
-                        'distance': hit['distance'],
-                        'similarity': round(similarity, 3)
-                    }
-                    
-                    # Add all entity fields
-                    for field in output_fields:
-                        result[field] = hit['entity'].get(field)
-                    
-                    formatted_results.append(result)
+            # IP on unit vectors: the distance is the cosine similarity itself
+            formatted_results = [
+                {
+                    'distance': hit['distance'],
+                    'similarity': round(max(0, hit['distance']), 3),
+                    # Missing fields come back as None
+                    **{field: hit['entity'].get(field) for field in output_fields}
+                }
+                for hits in results for hit in hits
+            ]
             
             self.logger.info(f"🔍 Found {len(formatted_results)} results")
             return formatted_results
@@ -356,23 +873,36 @@ class Milvus_VectorDatabase():
             raise
 
 
-    def get_collection_stats(self):
-        """Get statistics about the vector database"""
+    def get_collection_stats(self, max_age: float = STATS_TTL_SECONDS):
+        """
+        Get statistics about the vector database.
+        The row count is reused for `max_age` seconds (0 forces a fresh RPC);
+        inserts, bulk imports and collection changes invalidate it.
+        """
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
         try:
-            stats = self.client.get_collection_stats(self.collection_name)
-            count = stats['row_count']
+            now = time.monotonic()
+            if self._stats_cache and now - self._stats_cache[0] < max_age:
+                count = self._stats_cache[1]
+            else:
+                stats = self.client.get_collection_stats(self.collection_name)
+                count = stats['row_count']
+                self._stats_cache = (now, count)
             
             self.logger.info("📊 MILVUS VECTOR DATABASE STATISTICS")
             self.logger.info(f"Collection name:      {self.collection_name}")
             self.logger.info(f"Total properties:     {count:,}")
             self.logger.info(f"Embedding dimension:  {self.embedding_dim}")
-            self.logger.info(f"Metric type:          COSINE similarity")
+            self.logger.info(f"Metric type:          {METRIC_TYPE} (normalized vectors)")
             
             return count
             
         except Exception as e:
             self.logger.error(f"❌ Failed to get collection stats: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+# close() only detaches from the shared clients, their gRPC channels are closed once at exit
+atexit.register(Milvus_VectorDatabase.shutdown)
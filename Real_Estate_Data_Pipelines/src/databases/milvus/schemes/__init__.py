@@ -1 +1 @@
-from .PropertyVectorsSchema import get_property_schema
\ No newline at end of file
+from .PropertyVectorsSchema import get_property_schema
@@ -2,14 +2,17 @@
 Real Estate Data Preprocessing and Vector Database Storage with Milvus
 Loads data from BigQuery, preprocesses text, generates embeddings, and stores in Milvus
 """
+import os
 import warnings
 from typing import List, Dict, Any, Optional
 
 # Suppress unnecessary warnings
 warnings.filterwarnings("ignore")
 
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from tqdm import tqdm
 from Real_Estate_Data_Pipelines.src.logger import LoggerFactory
 
 
@@ -55,31 +58,33 @@ class PropertyVectorBuilder:
         - create searchable text
         - generate embeddings in batches
         """
-        from tqdm import tqdm
-        
-        transformed = []
-
         texts = []
         valid_props = []
+        insufficient_ids = []
+        create_searchable_text = self.preprocessor.create_searchable_text
 
-        # Prepare texts
-        for prop in tqdm(properties, desc="Preparing text"):
+        # Prepare texts (warnings for short texts are aggregated after the pass)
+        for prop in properties:
             try:
-                text = self.preprocessor.create_searchable_text(prop)
-
-                if not text or len(text) < 10:
-                    self.logger.warning(
-                        f"Property {prop.get('property_id')} has insufficient text"
-                    )
-                    continue
-
-                texts.append(text)
-                valid_props.append(prop)
-
+                text = create_searchable_text(prop)
             except Exception as e:
                 self.logger.error(
                     f"Text preprocessing failed for {prop.get('property_id')}: {e}"
                 )
+                continue
+
+            if not text or len(text) < 10:
+                insufficient_ids.append(prop.get('property_id'))
+                continue
+
+            texts.append(text)
+            valid_props.append(prop)
+
+        if insufficient_ids:
+            self.logger.warning(
+                f"{len(insufficient_ids):,} properties have insufficient text "
+                f"(e.g. {', '.join(map(str, insufficient_ids[:5]))})"
+            )
 
         if not texts:
             return []
@@ -94,22 +99,25 @@ class PropertyVectorBuilder:
             normalize=True
         )
 
-        # Attach embeddings back
+        # Attach embeddings back as float32 rows of the embedder's matrix (no per-float
+        # Python lists); the vector DB packs them back into one matrix per batch
         for prop, text, embedding in zip(valid_props, texts, embeddings):
             prop["text"] = text
-            prop["embedding"] = embedding.tolist()
-            transformed.append(prop)
+            prop["embedding"] = embedding
 
-        self.logger.info(f"✅ Transformed {len(transformed):,} properties")
-        return transformed
+        self.logger.info(f"✅ Transformed {len(valid_props):,} properties")
+        return valid_props
 
-    def process_store_to_vdb(self, limit: Optional[int] = None, batch_size: int = 1000) -> Dict[str, Any]:
+    def process_store_to_vdb(self, limit: Optional[int] = None, batch_size: int = 1000,
+                             max_inflight: int = 4) -> Dict[str, Any]:
         """
         Run the pipeline.
         
         Args:
             limit: Max properties to process
-            batch_size: Batch size for Milvus insert
+            batch_size: Embedding batch size
+            max_inflight: Concurrent upserts per record batch; each record batch holds
+                max_inflight upserts of the vector DB's optimal_batch_size rows
             
         Returns:
             Statistics dict
@@ -124,20 +132,43 @@ class PropertyVectorBuilder:
         properties = self.rdbms_client.get_validated_properties_for_vectordb(limit=limit, 
                                                                              exclude_ids = vectodb_ids)
         
-        if not properties:
+        if properties.num_rows == 0:
             self.logger.warning("No properties to process")
             return {'total': 0, 'inserted': 0, 'failed': 0}
         
-        # Transform (preprocess + embed)
-        self.logger.info(f"Transforming {len(properties):,} properties...")
-        transformed_properties = self.transform_properties(properties, batch_size)
-        
-        # Load into VECTORDB
-        self.logger.info(f"Loading into VECTORDB...")
-        results = self.vectordb_client.insert_properties(
-            transformed_properties, 
-            batch_size=batch_size
-        )
+        self.logger.info(f"Transforming {properties.num_rows:,} properties...")
+        results = {'total': 0, 'inserted': 0, 'failed': 0, 'failed_records': []}
+
+        # Materialize rows one Arrow batch at a time instead of the whole table, and embed
+        # the next batch while the previous one is loaded (one insert in flight). Each batch is
+        # large enough for insert_properties to keep max_inflight upserts going
+        chunk_size = self.vectordb_client.optimal_batch_size * max_inflight
+        with ThreadPoolExecutor(max_workers=1) as loader:
+            pending_insert = None
+            # Progress per batch, not per property
+            record_batches = tqdm(
+                properties.to_batches(max_chunksize=chunk_size),
+                total=-(-properties.num_rows // chunk_size),
+                desc="Vectorizing batches"
+            )
+            for record_batch in record_batches:
+                # Transform (preprocess + embed)
+                transformed_properties = self.transform_properties(record_batch.to_pylist(), batch_size)
+
+                if pending_insert is not None:
+                    self._add_batch_results(results, pending_insert.result())
+
+                # Load into VECTORDB
+                self.logger.info(f"Loading {len(transformed_properties):,} properties into VECTORDB...")
+                # No batch_size: the vector DB sizes its upserts from the schema (optimal_batch_size)
+                pending_insert = loader.submit(
+                    self.vectordb_client.insert_properties,
+                    transformed_properties,
+                    max_inflight=max_inflight
+                )
+
+            if pending_insert is not None:
+                self._add_batch_results(results, pending_insert.result())
         
         # Save failed records
         if results['failed_records']:
@@ -149,14 +180,30 @@ class PropertyVectorBuilder:
         return results
 
 
+    @staticmethod
+    def _add_batch_results(results: Dict, batch_results: Dict):
+        """Accumulate one insert_properties result into the run totals"""
+        for key in ('total', 'inserted', 'failed', 'failed_records'):
+            results[key] += batch_results[key]
+
     def save_failed_records(self, failed_records: List[Dict]):
         """Save failed records to JSON file"""
-        log_path = Path(self.logger.handlers[0].baseFilename).parent
+        # Same directory LoggerFactory writes the log files to
+        log_path = Path(self.log_dir)
         output_file = log_path / 'validation_failures.json'
+        tmp_file = output_file.with_suffix(output_file.suffix + '.tmp')
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(failed_records, f, indent=2, ensure_ascii=False)
+            # Write beside the target and swap it in, so a crash mid-write
+            # never leaves a truncated failures file behind
+            try:
+                # orjson writes UTF-8 (Arabic text kept as-is) straight to bytes
+                tmp_file.write_bytes(
+                    orjson.dumps(failed_records, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+                )
+                os.replace(tmp_file, output_file)
+            finally:
+                tmp_file.unlink(missing_ok=True)
             
             self.logger.warning(
                 f"⚠️ Saved {len(failed_records)} failed records to {output_file}"
@@ -1,53 +1,248 @@
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
 import numpy as np
-from typing import List
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Callable, List, Optional
 from sentence_transformers import SentenceTransformer
 from Real_Estate_Data_Pipelines.src.logger import LoggerFactory
 
+
+class _EncodeCoalescer:
+    """Gathers concurrent single-text encodes into one model batch"""
+
+    def __init__(self, encode_fn: Callable[[List[str], bool], np.ndarray],
+                 linger_ms: float, max_batch: int, timeout: Optional[float] = 60.0):
+        self.encode_fn = encode_fn
+        self.linger = linger_ms / 1000
+        self.max_batch = max_batch
+        self.timeout = timeout
+        # Set when the worker thread dies, later submits fail fast instead of waiting
+        self.error = None
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="embedding-coalescer", daemon=True)
+        self.thread.start()
+
+    def submit(self, prefixed_text: str, normalize: bool) -> np.ndarray:
+        """Queue one text and block until its batch has been encoded (up to `timeout` seconds)"""
+        if self.error is not None:
+            raise RuntimeError("Embedding coalescer stopped") from self.error
+        future = Future()
+        self.queue.put((prefixed_text, normalize, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drop the text if the worker hasn't picked it up yet
+            future.cancel()
+            raise
+
+    def _run(self):
+        items = []
+        try:
+            while True:
+                # Wait for a first request, then linger briefly for company
+                items = [self.queue.get()]
+                deadline = time.monotonic() + self.linger
+                while len(items) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(self.queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                # Skip texts whose caller timed out in the meantime
+                items = [item for item in items if item[2].set_running_or_notify_cancel()]
+                for normalize in {item[1] for item in items}:
+                    group = [(text, future) for text, flag, future in items if flag == normalize]
+                    try:
+                        embeddings = self.encode_fn([text for text, _ in group], normalize)
+                    except Exception as e:
+                        for _, future in group:
+                            future.set_exception(e)
+                        continue
+                    for (_, future), embedding in zip(group, embeddings):
+                        future.set_result(embedding)
+        except BaseException as e:
+            # Nobody serves the queue any more: fail the batch in hand and every queued text
+            self.error = e
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
 class EmbeddingService:
     """Handles embedding generation using Hugging Face SentenceTransformers"""
 
-    def __init__(self, model_name: str = 'intfloat/multilingual-e5-small', log_dir=None):
+    # E5 input prefixes
+    QUERY_PREFIX = "query: "
+    PASSAGE_PREFIX = "passage: "
+
+    def __init__(self, model_name: str = 'intfloat/multilingual-e5-small', log_dir=None,
+                 cache_path: Optional[str] = None, query_cache_size: int = 4096,
+                 encode_linger_ms: float = 0.0, encode_max_batch: int = 32,
+                 device: Optional[str] = None, half_precision: bool = True,
+                 backend: Optional[str] = None, encode_timeout: Optional[float] = 60.0):
         self.log_dir = log_dir
+        self.model_name = model_name
         self.logger = LoggerFactory.create_logger(log_dir=self.log_dir)
         self.logger.info(f"🤖 Loading Hugging Face model: {model_name}...")
 
-        # Load the model from Hugging Face
-        self.model = SentenceTransformer(model_name)
+        # Load the model from Hugging Face (device=None picks CUDA when available).
+        # backend="onnx"/"openvino" runs inference outside PyTorch, which cuts the
+        # per-call overhead of short queries (needs sentence-transformers[onnx])
+        model_kwargs = {"backend": backend} if backend else {}
+        self.model = SentenceTransformer(model_name, device=device, **model_kwargs)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
+        self.backend = getattr(self.model, "backend", "torch")
+
+        # FP16 weights halve memory traffic and use tensor cores on GPU;
+        # results are still handed out as float32
+        if half_precision and self.backend == "torch" and self.model.device.type == "cuda":
+            self.model.half()
+
+        self.logger.info(
+            f"✅ Model loaded (dimension: {self.embedding_dim}, backend: {self.backend}, "
+            f"device: {self.model.device})"
+        )
+
+        # Optional on-disk cache of passage embeddings, keyed by content hash
+        self.cache = None
+        if cache_path:
+            self.cache = sqlite3.connect(cache_path)
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self.logger.info(f"🗄️ Embedding cache: {cache_path}")
+
+        # Bounded in-memory cache for encode(), where the same queries repeat;
+        # per instance so it never outlives (or mixes) models
+        self._encode_cached = lru_cache(maxsize=query_cache_size)(self._encode_single)
 
-        self.logger.info(f"✅ Model loaded (dimension: {self.embedding_dim})")
+        # Optionally coalesce concurrent encode() misses (e.g. web requests)
+        # into one forward pass, at the cost of up to encode_linger_ms latency;
+        # a caller waits at most encode_timeout seconds for its batch
+        self._coalescer = None
+        if encode_linger_ms > 0:
+            self._coalescer = _EncodeCoalescer(
+                lambda texts, normalize: self.model.encode(
+                    texts,
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize,
+                    batch_size=encode_max_batch
+                ).astype(np.float32, copy=False),
+                encode_linger_ms,
+                encode_max_batch,
+                encode_timeout
+            )
 
     def encode(self, text: str, is_query: bool = True, normalize: bool = True) -> np.ndarray:
         """
         Generate embedding for a single text.
         E5 requires 'query: ' for search or 'passage: ' for document storage.
         """
-        prefix = "query: " if is_query else "passage: "
-        prefixed_text = f"{prefix}{text}"
+        prefix = self.QUERY_PREFIX if is_query else self.PASSAGE_PREFIX
+        prefixed_text = prefix + text
         
-        return self.model.encode(
-            prefixed_text,
-            convert_to_numpy=True,
-            normalize_embeddings=normalize
-        )
+        # Copy out of the cached bytes so callers may modify the result
+        return np.frombuffer(self._encode_cached(prefixed_text, normalize), dtype=np.float32).copy()
+
+    def _encode_single(self, prefixed_text: str, normalize: bool) -> bytes:
+        """Embed one already prefixed text as raw float32 bytes"""
+        if self._coalescer is not None:
+            embedding = self._coalescer.submit(prefixed_text, normalize)
+        else:
+            embedding = self.model.encode(
+                prefixed_text,
+                convert_to_numpy=True,
+                normalize_embeddings=normalize
+            )
+        return embedding.astype(np.float32, copy=False).tobytes()
 
     def encode_batch(self, texts: List[str], is_query: bool = False, 
-                     normalize: bool = True, batch_size: int = 16) -> List[np.ndarray]:
+                     normalize: bool = True, batch_size: int = 16,
+                     show_progress_bar: bool = False) -> np.ndarray:
         """
-        Generate embeddings for multiple texts.
+        Generate embeddings for multiple texts as one (len(texts), dim) float32 matrix.
         Defaults to 'passage: ' as batching is usually for document indexing.
+        No per-call progress bar by default; callers looping over batches report their own.
+        Each distinct text is encoded once (listings often share boilerplate);
+        with a cache, only texts not embedded before (by this model) are encoded.
         """
-        prefix = "query: " if is_query else "passage: "
-        prefixed_texts = [f"{prefix}{t}" for t in texts]
+        prefix = self.QUERY_PREFIX if is_query else self.PASSAGE_PREFIX
+        prefixed_texts = list(map(prefix.__add__, texts))
+        
+        if self.cache is None:
+            # Position of each text's first occurrence, then fan the rows back out
+            first_index = {}
+            positions = [first_index.setdefault(text, len(first_index)) for text in prefixed_texts]
+            if len(first_index) == len(prefixed_texts):
+                return self._encode(prefixed_texts, normalize, batch_size, show_progress_bar)
+            return self._encode(list(first_index), normalize, batch_size, show_progress_bar)[positions]
+        
+        keys = [self._cache_key(text, normalize) for text in prefixed_texts]
+        vectors = self._cache_lookup(keys)
         
+        # Encode each missing text once, even if it repeats in the batch
+        missing = {key: text for key, text in zip(keys, prefixed_texts) if key not in vectors}
+        if missing:
+            encoded = self._encode(list(missing.values()), normalize, batch_size, show_progress_bar)
+            new_vectors = dict(zip(missing, encoded))
+            self.cache.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in new_vectors.items()]
+            )
+            self.cache.commit()
+            vectors.update(new_vectors)
+        
+        self.logger.info(f"🗄️ Embedding cache hits: {len(keys) - len(missing):,}/{len(keys):,}")
+        
+        # Fill one preallocated matrix rather than stacking per-row arrays
+        out = np.empty((len(keys), self.embedding_dim), dtype=np.float32)
+        for i, key in enumerate(keys):
+            out[i] = vectors[key]
+        return out
+
+    def _encode(self, prefixed_texts: List[str], normalize: bool, batch_size: int,
+                show_progress_bar: bool) -> np.ndarray:
+        """Run the model over already prefixed texts"""
         return self.model.encode(
             prefixed_texts,
             convert_to_numpy=True,
             normalize_embeddings=normalize,
             batch_size=batch_size,
-            show_progress_bar=True
-        )
+            show_progress_bar=show_progress_bar
+        ).astype(np.float32, copy=False)
+
+    def _cache_key(self, prefixed_text: str, normalize: bool) -> bytes:
+        """Content hash of a text for this model and normalization"""
+        return hashlib.blake2b(
+            f"{self.model_name}\0{normalize}\0{prefixed_text}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+
+    def _cache_lookup(self, keys: List[bytes], chunk_size: int = 500) -> dict:
+        """Fetch cached vectors for the given keys (chunked under SQLite's variable limit)"""
+        vectors = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), chunk_size):
+            chunk = unique_keys[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.cache.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            vectors.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+        return vectors
 
     def get_dimension(self) -> int:
         """Get embedding dimension (384 for multilingual-e5-small)"""
-        return self.embedding_dim
\ No newline at end of file
+        return self.embedding_dim
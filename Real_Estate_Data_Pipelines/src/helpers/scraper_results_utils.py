@@ -1,6 +1,6 @@
-import json
 import os
 import boto3
+import orjson
 
 def scraper_report(results, logger):
     """Print detailed summary"""
@@ -54,27 +54,90 @@ def scraper_report(results, logger):
 
 
 def save_to_json(filename, results, logger):
-    """Save results to JSON (append mode)""" 
-    # Load existing data if file exists
-    existing_data = []
+    """
+    Append results to a JSON Lines file, deduplicated by property_id.
+    Saved ids are kept in a sidecar index, so a save reads the index and writes
+    only the new records; use compact_to_json when a single JSON array is needed.
+    """
+    ids_filename = f"{filename}.ids"
+    existing_ids = _load_saved_ids(filename, ids_filename, logger)
+
+    new_items = []
+    missing_id = 0
+    for item in results:
+        property_id = item.get('property_id')
+        if not property_id:
+            missing_id += 1
+        elif property_id not in existing_ids:
+            existing_ids.add(property_id)
+            new_items.append(item)
+    if missing_id:
+        logger.warning(f"⚠️ Skipped {missing_id} results without a property_id")
+
+    if new_items:
+        # Records first: a crash before the index is updated only leaves a stale index,
+        # which is detected and rebuilt on the next save
+        with open(filename, 'ab') as f:
+            f.writelines(orjson.dumps(item) + b"\n" for item in new_items)
+        with open(ids_filename, 'a', encoding='utf-8') as f:
+            f.writelines(f"{item['property_id']}\n" for item in new_items)
+        _stamp_index(filename, ids_filename)
+
+    logger.info(f"✅ Added {len(new_items)} new properties to {filename} (Total: {len(existing_ids)})")
+
+
+def compact_to_json(filename, output_filename, logger):
+    """Write the records of a save_to_json file as one JSON array, joining lines without parsing them"""
+    tmp_filename = f"{output_filename}.tmp"
+    count = 0
+    with open(filename, 'rb') as f, open(tmp_filename, 'wb') as out:
+        out.write(b"[")
+        for line in f:
+            line = line.strip()
+            if line:
+                out.write((b",\n" if count else b"\n") + line)
+                count += 1
+        out.write(b"\n]\n")
+    os.replace(tmp_filename, output_filename)
+
+    logger.info(f"✅ Compacted {count} properties into {output_filename}")
+
+
+def _load_saved_ids(filename, ids_filename, logger):
+    """property_ids already saved, from the sidecar index when it matches the records file"""
+    legacy_filename = f"{os.path.splitext(filename)[0]}.json"
+    if not os.path.exists(filename) and legacy_filename != filename and os.path.exists(legacy_filename):
+        # Carry over a JSON array written by the earlier array-based save_to_json
+        logger.info(f"Creating {filename} from {legacy_filename}")
+        with open(legacy_filename, 'rb') as f:
+            existing_data = orjson.loads(f.read())
+        with open(filename, 'wb') as f:
+            f.writelines(orjson.dumps(item) + b"\n" for item in existing_data)
+
+    if not os.path.exists(filename):
+        existing_ids = set()
+    elif (os.path.exists(ids_filename)
+          and os.stat(ids_filename).st_mtime_ns == os.stat(filename).st_mtime_ns):
+        with open(ids_filename, 'r', encoding='utf-8') as f:
+            return set(f.read().splitlines())
+    else:
+        # Index missing, or written for another version of the file (rotated, restored, crash)
+        logger.info(f"Rebuilding id index of {filename}")
+        with open(filename, 'rb') as f:
+            existing_ids = {orjson.loads(line).get('property_id') for line in f if line.strip()}
+        existing_ids.discard(None)
+
+    with open(ids_filename, 'w', encoding='utf-8') as f:
+        f.writelines(f"{property_id}\n" for property_id in existing_ids)
     if os.path.exists(filename):
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-        except json.JSONDecodeError:
-            logger.warning(f"Could not read existing {filename}, starting fresh")
-        
-    # Merge new results with existing (avoid duplicates by property_id)
-    existing_ids = {item.get('property_id') for item in existing_data}
-    new_items = [item for item in results if item.get('property_id') not in existing_ids]
-        
-    combined_data = existing_data + new_items
-        
-    # Save combined data
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(combined_data, f, indent=2, ensure_ascii=False)
-        
-    logger.info(f"✅ Added {len(new_items)} new properties to {filename} (Total: {len(combined_data)})")
+        _stamp_index(filename, ids_filename)
+    return existing_ids
+
+
+def _stamp_index(filename, ids_filename):
+    """Give the index the mtime of the records file it describes"""
+    stat = os.stat(filename)
+    os.utime(ids_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
 
 
 def upload_to_s3(local_file_path, s3_key, logger, bucket_name = "real-estate-301"):
@@ -1,6 +1,29 @@
 import re
+from functools import lru_cache
 from typing import Optional
 import json
+
+# Single-character rewrites applied in one translate pass: bullets and
+# line breaks become spaces, Eastern Arabic numerals become Western, and
+# alef/yaa variants are normalized
+_CHAR_MAP = str.maketrans({
+    **dict.fromkeys('▪•●◼◾▫◽\n\r\t', ' '),
+    **dict(zip('٠١٢٣٤٥٦٧٨٩', '0123456789')),
+    **dict.fromkeys('إأآ', 'ا'),
+    'ى': 'ي',
+})
+
+# Patterns, compiled once rather than looked up on every call
+_TAA_MARBUTA = re.compile(r'[هة]\b')
+# Anything outside word chars, whitespace, Arabic and %., plus the Arabic
+# comma and question mark (unwanted symbols)
+_DISALLOWED = re.compile(r'[^\w\s\u0600-\u06FF%.,]|[،؟]')
+_SPACES = re.compile(r'\s+')
+
+# json.dumps builds a new encoder whenever non-default options are passed
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
 class TextPreprocessor:
     """Handles all text cleaning and preprocessing logic"""
 
@@ -17,33 +40,33 @@ class TextPreprocessor:
 
         text = str(text)
 
-        # Replace bullets with spaces
-        text = re.sub(r'[▪•●◼◾▫◽]', ' ', text)
+        # Bullets/newlines to spaces, numerals to Western, letter normalization
+        text = text.translate(_CHAR_MAP)
 
-        # Replace newlines/tabs
-        text = re.sub(r'[\n\r\t]+', ' ', text)
+        # Word-final taa marbuta (before symbols are stripped, which can
+        # move word boundaries)
+        text = _TAA_MARBUTA.sub('ه', text)
 
-        # Convert Eastern Arabic numerals to Western
-        arabic_numbers = '٠١٢٣٤٥٦٧٨٩'
-        english_numbers = '0123456789'
-        translation_table = str.maketrans(arabic_numbers, english_numbers)
-        text = text.translate(translation_table)
+        # Remove unwanted symbols and keep only allowed characters
+        text = _DISALLOWED.sub('', text)
 
-        # Normalization
-        text = re.sub(r'[إأآا]', 'ا', text)
-        text = re.sub(r'[يى]', 'ي', text)
-        text = re.sub(r'[هة]\b', 'ه', text)
+        # Collapse multiple spaces
+        text = _SPACES.sub(' ', text)
 
-        # Remove unwanted symbols
-        text = re.sub(r'[،/!؟💰:()+-]', '', text)
+        return text.strip()
 
-        # Keep only allowed characters
-        text = re.sub(r'[^\w\s\u0600-\u06FF%.,]', '', text)
+    # Fields combined into the searchable text, in order
+    SEARCHABLE_FIELDS = ('title', 'address', 'description', 'location', 'property_type')
 
-        # Collapse multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+    # Low-cardinality fields, repeated across many listings; their cleaned
+    # values are memoized instead of re-cleaned per listing
+    REPEATED_FIELDS = frozenset({'address', 'location', 'property_type'})
 
-        return text.strip()
+    # Mapping for locations (can expand as needed)
+    LOCATION_MAP = {
+        "alexandria": "الاسكندرية",
+        "cairo": "القاهرة"
+    }
 
     def create_searchable_text(self, property_data: dict):
         """
@@ -52,56 +75,29 @@ class TextPreprocessor:
 
         Args:
             property_data (dict): Dictionary containing property fields.
-            return_json (bool): If True, returns a JSON-like dict with each field cleaned.
 
         Returns:
-            dict: JSON dict.
+            str: JSON string with each non-empty field cleaned.
         """
-        # Mapping for locations (can expand as needed)
-        location_map = {
-            "alexandria": "الاسكندرية",
-            "cairo": "القاهرة"
-        }
-
-        text_parts = []
         json_output = {}
 
-        # Title
-        title = property_data.get('title', '')
-        title_clean = self.clean_arabic_text(title)
-        if title_clean:
-            text_parts.append(title_clean)
-            json_output['title'] = title_clean
-
-        # Address
-        address = property_data.get('address', '')
-        address_clean = self.clean_arabic_text(address)
-        if address_clean:
-            text_parts.append(address_clean)
-            json_output['address'] = address_clean
-
-        # Description
-        description = property_data.get('description', '')
-        description_clean = self.clean_arabic_text(description)
-        if description_clean:
-            text_parts.append(description_clean)
-            json_output['description'] = description_clean
-
-        # Location
-        location = property_data.get('location', '').lower()
-        location_clean = location_map.get(location, location)
-        location_clean = self.clean_arabic_text(location_clean)
-        if location_clean:
-            text_parts.append(location_clean)
-            json_output['location'] = location_clean
-
-        # Property type
-        prop_type = property_data.get('property_type', '')
-        prop_type_clean = self.clean_arabic_text(prop_type)
-        if prop_type_clean:
-            text_parts.append(prop_type_clean)
-            json_output['property_type'] = prop_type_clean
-
-        # combined_text = " ".join(text_parts).strip()
-
-        return json.dumps(json_output, ensure_ascii=False)
\ No newline at end of file
+        for field in self.SEARCHABLE_FIELDS:
+            value = property_data.get(field) or ''
+
+            # Location names are translated to Arabic when known
+            if field == 'location':
+                value = value.lower()
+                value = self.LOCATION_MAP.get(value, value)
+
+            if field in self.REPEATED_FIELDS and isinstance(value, str):
+                value_clean = _clean_repeated(value)
+            else:
+                value_clean = self.clean_arabic_text(value)
+            if value_clean:
+                json_output[field] = value_clean
+
+        return _JSON_ENCODER.encode(json_output)
+
+
+# Shared across instances; bounded because not every address repeats
+_clean_repeated = lru_cache(maxsize=16384)(TextPreprocessor.clean_arabic_text)
@@ -1,5 +1,8 @@
 # logger_util.py
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 from datetime import datetime
 import inspect
@@ -39,7 +42,16 @@ class LoggerFactory:
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
+            # Callers only enqueue records; a listener thread does the formatting and
+            # file/console writes, so hot loops never block on log I/O
+            log_queue = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True
+            )
+            listener.start()
+            # Drain the queue before the process exits
+            atexit.register(listener.stop)
+
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
         return logger
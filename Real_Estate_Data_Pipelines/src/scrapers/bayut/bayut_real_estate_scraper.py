@@ -219,7 +219,6 @@ class BAYUTRealEstateScraper:
                                 if area_value:
                                     try:
                                         # Remove any non-numeric characters except decimal point
-                                        import re
                                         area_clean = re.sub(r'[^\d.]', '', str(area_value))
                                         area_sqm = float(area_clean)
                                     except:
@@ -266,7 +265,6 @@ class BAYUTRealEstateScraper:
                                 
                                 # Extract WhatsApp from description if not found
                                 if not agent_phone and description:
-                                    import re
                                     whatsapp_match = re.search(r'https://wa\.me/(\d+)', description)
                                     if whatsapp_match:
                                         agent_whatsapp = f"+{whatsapp_match.group(1)}"
@@ -284,7 +282,6 @@ class BAYUTRealEstateScraper:
             
             # Fallback: Extract price from description if not found in JSON-LD
             if not price_egp and description:
-                import re
                 # Look for price patterns in description
                 price_patterns = [
                     r'بسعر\s*:\s*([\d,]+)\s*ج',
@@ -12,7 +12,7 @@ def test_scrapers_operations():
 
     # Path Configuration
     PROJECT_ROOT = Path(__file__).resolve().parents[3]
-    OUTPUT_JSON = PROJECT_ROOT / "Real_Estate_Data_Pipelines" / "raw_data" / "scraping" / "alexandria_for_sale.json"
+    OUTPUT_JSON = PROJECT_ROOT / "Real_Estate_Data_Pipelines" / "raw_data" / "scraping" / "alexandria_for_sale.jsonl"
 
     # Load Config
     cfg = config
@@ -37,6 +37,7 @@ def test_scrapers_operations():
         project_id=cfg.GCP_PROJECT_ID,
         raw_dataset_id=cfg.BQ_RAW_DATASET_ID,
         raw_table_id=cfg.BQ_RAW_TABLE_ID,
+        maximum_bytes_billed=cfg.BQ_MAXIMUM_BYTES_BILLED,
         log_dir=cfg.LOG_DIR,
     )
     
@@ -81,7 +82,7 @@ def test_scrapers_operations():
             save_to_json(filename=str(OUTPUT_JSON), results=scraper.results, logger=logger)
 
             upload_to_s3(local_file_path=str(OUTPUT_JSON), 
-                         s3_key="raw_data/alexandria_for_sale.json", 
+                         s3_key="raw_data/alexandria_for_sale.jsonl", 
                          logger=logger, 
                          bucket_name = "real-estate-301")
             
@@ -108,7 +109,7 @@ def test_scrapers_operations():
         if scraper.results:
             save_to_json(filename=str(OUTPUT_JSON), results=scraper.results, logger=logger)
             upload_to_s3(local_file_path=str(OUTPUT_JSON), 
-                         s3_key="raw_data/alexandria_for_sale.json", 
+                         s3_key="raw_data/alexandria_for_sale.jsonl", 
                          logger=logger, 
                          bucket_name = "real-estate-301")
             logger.info("💾 Partial results saved before exit")
@@ -118,10 +119,10 @@ def test_scrapers_operations():
 
         if scraper.results:
             try:
-                fallback_path = OUTPUT_JSON.with_name("aqarmap_partial_fallback.json")
+                fallback_path = OUTPUT_JSON.with_name("aqarmap_partial_fallback.jsonl")
                 save_to_json(filename=str(fallback_path), results=scraper.results, logger=logger)
                 upload_to_s3(local_file_path=str(fallback_path), 
-                         s3_key="raw_data/aqarmap_partial_fallback.json", 
+                         s3_key="raw_data/aqarmap_partial_fallback.jsonl", 
                          logger=logger, 
                          bucket_name = "real-estate-301")
                 logger.info(f"💾 Partial results saved → {fallback_path}")
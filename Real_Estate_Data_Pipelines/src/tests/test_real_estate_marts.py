@@ -33,6 +33,7 @@ def test_mart_builder_operations():
         raw_table_id=cfg.BQ_RAW_TABLE_ID,
         mart_dataset_id=cfg.BQ_MART_DATASET_ID,
         mart_table_id=cfg.BQ_MART_TABLE_ID,
+        maximum_bytes_billed=cfg.BQ_MAXIMUM_BYTES_BILLED,
         log_dir=cfg.LOG_DIR,
     )
 
@@ -10,7 +10,12 @@ def initialize_embedding_model(cfg):
     global model, vectordb
     
     # Initialize embedding service
-    model = EmbeddingService(cfg.EMBEDDING_MODEL, log_dir=cfg.LOG_DIR)
+    model = EmbeddingService(
+        cfg.EMBEDDING_MODEL,
+        log_dir=cfg.LOG_DIR,
+        encode_linger_ms=cfg.EMBEDDING_LINGER_MS,
+        backend=cfg.EMBEDDING_BACKEND
+    )
 
     
     # Initialize and connect to Milvus
@@ -46,9 +51,8 @@ def search_properties(data):
     # Generate query embedding
     query_embedding = model.encode(
         query, 
-        is_query = True,
-        convert_to_numpy=True, 
-        normalize_embeddings=True
+        is_query=True,
+        normalize=True
     )
     
     # Build filter expression from data